@@ -1,14 +1,14 @@
 """
 Etherscan API Client
 ====================
-Fetches blockchain data from Etherscan and saves to CSV.
+Fetches blockchain data from Etherscan and saves to Parquet.
 """
 
 import sys
-import time
-import requests
+import orjson
 import pandas as pd
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path so we can import config
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -23,16 +23,30 @@ from utils.config import (
     EXTRACTION_START_DATE,
     EXTRACTION_END_DATE,
     BRIDGE_LOGS_FILE,
-    REQUEST_DELAY
+    REQUESTS_PER_SECOND
 )
 from utils.block_utils import get_eth_block_by_date
+from utils.hex_utils import hex_series_to_int64
+from utils.http_utils import create_session
 
 
 # =============================================================================
-# SESSION (reuse connection)
+# SESSION (reuse connection, retries and rate limit handled by the session)
 # =============================================================================
 
-session = requests.Session()
+session = create_session(max_requests_per_second=REQUESTS_PER_SECOND)
+
+
+# Hex-encoded integer fields, decoded once before saving
+HEX_INT_COLUMNS = ["blockNumber", "timeStamp", "gasPrice", "gasUsed", "logIndex", "transactionIndex"]
+
+# Block-range chunks fetched at once. Chunks are independent, so the next
+# chunk's pages are requested while the current one is still paginating;
+# the shared rate limiter still caps the overall request rate.
+CHUNK_FETCH_WORKERS = 2
+
+# Rows per Parquet row group - small enough that date/block filters skip whole groups
+ROW_GROUP_SIZE = 65_536
 
 
 # =============================================================================
@@ -55,7 +69,7 @@ def get_logs(address, topic0, from_block, to_block):
     }
     
     response = session.get(ETHERSCAN_URL, params=params, timeout=30)
-    data = response.json()
+    data = orjson.loads(response.content)
     
     if data.get("status") == "1":
         return data.get("result", [])
@@ -67,7 +81,7 @@ def get_logs(address, topic0, from_block, to_block):
     return []
 
 
-def get_logs_for_range(address, topic0, from_block, to_block, max_retries=3):
+def get_logs_for_range(address, topic0, from_block, to_block):
     """Fetch logs for a specific block range with pagination (max 10,000 per range)."""
     logs = []
     page = 1
@@ -86,20 +100,13 @@ def get_logs_for_range(address, topic0, from_block, to_block, max_retries=3):
             "apikey": ETHERSCAN_API_KEY
         }
         
-        # Retry logic for connection errors
-        for attempt in range(max_retries):
-            try:
-                response = session.get(ETHERSCAN_URL, params=params, timeout=30)
-                data = response.json()
-                break
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2
-                    print(f"   ⏳ Retry {attempt + 1}/{max_retries} after {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"   ❌ Failed after {max_retries} retries: {e}")
-                    return logs
+        # Transient errors are already retried by the session adapter
+        try:
+            response = session.get(ETHERSCAN_URL, params=params, timeout=30)
+            data = orjson.loads(response.content)
+        except Exception as e:
+            print(f"   ❌ Request failed: {e}")
+            return logs
         
         # Check for API errors
         if data.get("status") != "1":
@@ -120,45 +127,51 @@ def get_logs_for_range(address, topic0, from_block, to_block, max_retries=3):
             break
         
         page += 1
-        time.sleep(REQUEST_DELAY)
     
     return logs
 
 
 def get_all_logs(address, topic0, from_block, to_block, chunk_size=100000):
-    """Fetch ALL logs by splitting into block range chunks to bypass 10k limit."""
+    """Fetch ALL logs by splitting into block range chunks to bypass 10k limit.
+    
+    Up to CHUNK_FETCH_WORKERS chunks are fetched concurrently (each one still
+    pages serially); results are collected in block order.
+    """
     all_logs = []
-    current_block = from_block
-    chunk_num = 1
+    ranges = [
+        (start, min(start + chunk_size - 1, to_block))
+        for start in range(from_block, to_block + 1, chunk_size)
+    ]
     
     print(f"📥 Fetching logs from {address[:10]}...")
     print(f"   Blocks: {from_block} → {to_block}")
-    print(f"   Using chunk size: {chunk_size:,} blocks")
+    print(f"   Using chunk size: {chunk_size:,} blocks ({CHUNK_FETCH_WORKERS} fetched at a time)")
     
-    while current_block <= to_block:
-        chunk_end = min(current_block + chunk_size - 1, to_block)
-        
-        print(f"\n📦 Chunk {chunk_num}: blocks {current_block:} → {chunk_end:}")
-        chunk_logs = get_logs_for_range(address, topic0, current_block, chunk_end)
-        all_logs.extend(chunk_logs)
+    with ThreadPoolExecutor(max_workers=CHUNK_FETCH_WORKERS) as executor:
+        chunks = executor.map(lambda r: get_logs_for_range(address, topic0, *r), ranges)
         
-        print(f"   Got {len(chunk_logs):,} logs (total: {len(all_logs):,})")
-        
-        current_block = chunk_end + 1
-        chunk_num += 1
-        time.sleep(REQUEST_DELAY)
+        for chunk_num, ((chunk_start, chunk_end), chunk_logs) in enumerate(zip(ranges, chunks), start=1):
+            all_logs.extend(chunk_logs)
+            
+            print(f"\n📦 Chunk {chunk_num}: blocks {chunk_start:} → {chunk_end:}")
+            print(f"   Got {len(chunk_logs):,} logs (total: {len(all_logs):,})")
     
     print(f"\n✅ Done! Got {len(all_logs):,} total logs")
     return all_logs
 
 
-def save_to_csv(logs, output_path):
-    """Save raw logs to CSV file."""
+def save_logs(logs, output_path):
+    """Save raw logs to Parquet (zstd), with hex integer fields decoded to int64."""
     output_path = Path(PROJECT_ROOT) / output_path
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
     df = pd.DataFrame(logs)
-    df.to_csv(output_path, index=False)
+    for col in HEX_INT_COLUMNS:
+        if col in df.columns:
+            # Whole-column decode; "0x" (Etherscan's zero, e.g. first logIndex) -> 0
+            df[col] = hex_series_to_int64(df[col])
+    
+    df.to_parquet(output_path, index=False, compression="zstd", row_group_size=ROW_GROUP_SIZE)
     
     print(f"💾 Saved {len(df)} rows to {output_path}")
     return df
@@ -193,6 +206,6 @@ if __name__ == "__main__":
     )
     
     if logs:
-        df = save_to_csv(logs, BRIDGE_LOGS_FILE)
+        df = save_logs(logs, BRIDGE_LOGS_FILE)
         print(f"\n📄 Sample row:")
         print(df.iloc[0].to_dict())
@@ -5,10 +5,16 @@ Fetches all transactions for bridged wallets from Lineascan.
 """
 
 import sys
-import time
+import orjson
 import requests
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add project root to path so we can import config
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -22,17 +28,65 @@ from utils.config import (
     EXTRACTION_START_DATE,
     EXTRACTION_END_DATE,
     PROCESSED_DATA_DIR,
-    RAW_DATA_DIR,
-    REQUEST_DELAY
+    LINEA_TXS_FILE,
+    RESPONSE_CACHE_FILE,
+    REFRESH_RESPONSE_CACHE,
+    REQUESTS_PER_SECOND
 )
 from utils.block_utils import get_linea_block_by_date
+from utils.http_utils import create_session
+from utils.response_cache import ResponseCache
 
 
 # =============================================================================
-# SESSION (reuse connection)
+# SESSION (reuse connection, retries and rate limit handled by the session)
 # =============================================================================
 
-session = requests.Session()
+# Size the connection pool for the wallet workers plus range-split fetches,
+# so parallel threads reuse keep-alive connections instead of reconnecting.
+# The rate limit is shared by all threads, so adding workers only adds
+# requests in flight (hiding API latency), never exceeds the API limit.
+HTTP_POOL_SIZE = 16
+session = create_session(pool_size=HTTP_POOL_SIZE, max_requests_per_second=REQUESTS_PER_SECOND)
+
+# txlist returns at most page * offset <= 10,000 rows for one query
+MAX_RESULT_WINDOW = 10_000
+
+# Rows per txlist request. The whole result window fits in one page, so a
+# wallet costs one round trip instead of one per 1,000 rows.
+TXLIST_PAGE_SIZE = MAX_RESULT_WINDOW
+
+# txlist fields as returned by the API (all strings) + the wallet we queried
+TRANSACTION_FIELDS = [
+    "blockNumber", "blockHash", "timeStamp", "hash", "nonce", "transactionIndex",
+    "from", "to", "value", "gas", "gasPrice", "input", "methodId", "functionName",
+    "contractAddress", "cumulativeGasUsed", "txreceipt_status", "gasUsed",
+    "confirmations", "isError", "wallet"
+]
+API_SCHEMA = pa.schema([(field, pa.string()) for field in TRANSACTION_FIELDS])
+
+# Fields the API always fills with decimal integers that fit int64.
+# value (wei) can exceed int64 and isError/txreceipt_status may be empty, so they stay strings.
+INT64_FIELDS = {
+    "blockNumber", "timeStamp", "nonce", "transactionIndex", "gas", "gasPrice",
+    "cumulativeGasUsed", "gasUsed", "confirmations"
+}
+TRANSACTION_SCHEMA = pa.schema([
+    (field, pa.int64() if field in INT64_FIELDS else pa.string()) for field in TRANSACTION_FIELDS
+])
+
+# Text Arrow's int64 cast parses without overflow: decimal or 0x-hex integers
+INT64_TEXT_PATTERN = r"^(-?\d{1,18}|0[xX][0-9a-fA-F]{1,15})$"
+
+# Flush pending rows once this many accumulate, even between wallet checkpoints,
+# so a few very active wallets cannot grow the in-memory buffer without bound
+MAX_PENDING_ROWS = 65_536
+
+
+@lru_cache(maxsize=1)
+def get_response_cache():
+    """Open the txlist response cache on first use (shared by all threads)."""
+    return ResponseCache(Path(PROJECT_ROOT) / RESPONSE_CACHE_FILE)
 
 
 # =============================================================================
@@ -42,42 +96,55 @@ session = requests.Session()
 def load_unique_wallets(logs_path, start_date=EXTRACTION_START_DATE):
     """Load unique wallet addresses from logs (filtered by date).
     
-    Supports both raw logs (etherscan_logs.csv with timeStamp) 
-    and processed logs (transformed_logs.csv with datetime).
+    Supports both raw logs (etherscan_logs with timeStamp) 
+    and processed logs (transformed_logs.csv with datetime), as CSV or Parquet.
+    The date filter and wallet-column projection are pushed into the scan, so
+    only the wallet column of in-range rows is materialized (and Parquet row
+    groups outside the range are skipped via their statistics).
     """
-    df = pd.read_csv(logs_path)
-    
-    # Filter by date - handle both raw (timeStamp) and processed (datetime) formats
-    if "timeStamp" in df.columns:
-        # Raw logs: convert Unix timestamp to datetime
-        df["datetime"] = pd.to_datetime(df["timeStamp"].astype(int), unit="s")
-        df = df[df["datetime"] >= start_date]
-        print(f"📅 Filtered to transactions from {start_date} onwards")
-        print(f"   Transactions in range: {len(df):,}")
-    elif "datetime" in df.columns:
-        df["datetime"] = pd.to_datetime(df["datetime"])
-        df = df[df["datetime"] >= start_date]
-        print(f"📅 Filtered to transactions from {start_date} onwards")
-        print(f"   Transactions in range: {len(df):,}")
+    logs_path = Path(logs_path)
+    dataset = ds.dataset(logs_path, format="parquet" if logs_path.suffix == ".parquet" else "csv")
+    schema = dataset.schema
     
     # The column name varies: _from (raw), from_address (processed), from
-    if "_from" in df.columns:
-        wallets = df["_from"].unique()
-    elif "from_address" in df.columns:
-        wallets = df["from_address"].unique()
-    elif "from" in df.columns:
-        wallets = df["from"].unique()
-    else:
-        print(f"Available columns: {df.columns.tolist()}")
+    wallet_col = next((c for c in ("_from", "from_address", "from") if c in schema.names), None)
+    if wallet_col is None:
+        print(f"Available columns: {schema.names}")
         raise ValueError("Could not find wallet address column")
     
-    return list(wallets)
+    # Filter by date - handle both raw (timeStamp) and processed (datetime) formats
+    start = pd.Timestamp(start_date, tz="UTC")
+    row_filter = None
+    if "timeStamp" in schema.names:
+        # Raw logs: Unix timestamp in seconds
+        row_filter = ds.field("timeStamp") >= int(start.timestamp())
+    elif "datetime" in schema.names:
+        datetime_type = schema.field("datetime").type
+        if datetime_type.tz is None:
+            start = start.tz_localize(None)
+        row_filter = ds.field("datetime") >= pa.scalar(start, type=datetime_type)
+    
+    table = dataset.to_table(columns=[wallet_col], filter=row_filter)
+    if row_filter is not None:
+        print(f"📅 Filtered to transactions from {start_date} onwards")
+        print(f"   Transactions in range: {table.num_rows:,}")
+    
+    return pc.unique(table[wallet_col]).to_pylist()
 
 
-def get_transactions(address, start_block, end_block, max_retries=5):
-    """Fetch all transactions for a wallet address on Linea."""
+def get_transactions(address, start_block, end_block):
+    """Fetch all transactions for a wallet address on Linea.
+    
+    Returns at most MAX_RESULT_WINDOW rows (see get_transactions_in_range for
+    busier wallets), fetched in pages of TXLIST_PAGE_SIZE.
+    
+    Every successful page (including "No transactions found") is cached by
+    (address, start_block, end_block, page, page size), so a rerun over the
+    same block range replays it from disk instead of calling the API.
+    """
     all_txs = []
     page = 1
+    response_cache = get_response_cache()
     
     while True:
         params = {
@@ -88,59 +155,30 @@ def get_transactions(address, start_block, end_block, max_retries=5):
             "startblock": start_block,
             "endblock": end_block,
             "page": page,
-            "offset": 1000,
+            "offset": TXLIST_PAGE_SIZE,
             "sort": "asc",
             "apikey": LINEASCAN_API_KEY
         }
         
-        # Retry logic for connection errors and empty responses
-        data = None
-        for attempt in range(max_retries):
+        cache_key = f"txlist:{address.lower()}:{start_block}:{end_block}:{page}:{TXLIST_PAGE_SIZE}"
+        body = None if REFRESH_RESPONSE_CACHE else response_cache.get(cache_key)
+        
+        if body is not None:
+            data = orjson.loads(body)
+        else:
+            # Connection errors, 429s and 5xx are already retried by the session adapter
             try:
                 response = session.get(LINEASCAN_URL, params=params, timeout=30)
-                
-                # Check HTTP status
-                if response.status_code != 200:
-                    print(f"   ⚠️ HTTP {response.status_code} for {address[:10]}... (retry {attempt+1}/{max_retries})")
-                    if attempt < max_retries - 1:
-                        time.sleep((attempt + 1) * 2)
-                        continue
-                    return all_txs
-                
-                # Check for empty response
-                if not response.text or response.text.strip() == "":
-                    print(f"   ⚠️ Empty response for {address[:10]}... (retry {attempt+1}/{max_retries})")
-                    if attempt < max_retries - 1:
-                        time.sleep((attempt + 1) * 2)
-                        continue
-                    return all_txs
-                
-                data = response.json()
-                break
-                
-            except requests.exceptions.JSONDecodeError as e:
-                print(f"   ⚠️ JSON decode error for {address[:10]}... (retry {attempt+1}/{max_retries})")
-                if attempt < max_retries - 1:
-                    time.sleep((attempt + 1) * 2)
-                    continue
-                return all_txs
-                
-            except requests.exceptions.RequestException as e:
-                print(f"   ⚠️ Request error: {type(e).__name__} (retry {attempt+1}/{max_retries})")
-                if attempt < max_retries - 1:
-                    time.sleep((attempt + 1) * 2)
-                    continue
-                return all_txs
-                
-            except Exception as e:
-                print(f"   ⚠️ Unexpected error: {e} (retry {attempt+1}/{max_retries})")
-                if attempt < max_retries - 1:
-                    time.sleep((attempt + 1) * 2)
-                    continue
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+            except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+                print(f"   ⚠️ Request failed for {address[:10]}...: {type(e).__name__}")
                 return all_txs
-        
-        if data is None:
-            return all_txs
+            
+            # Cache real answers only (not rate-limit or other API errors);
+            # an empty wallet comes back as status 0 / "No transactions found"
+            if data.get("status") == "1" or "No transactions found" in str(data.get("message", "")):
+                response_cache.put(cache_key, response.content)
         
         # Check for API errors
         if data.get("status") != "1":
@@ -159,26 +197,97 @@ def get_transactions(address, start_block, end_block, max_retries=5):
         
         all_txs.extend(batch)
         
-        if len(batch) < 1000:
+        # Last page, or the next one would be past the result window
+        if len(batch) < TXLIST_PAGE_SIZE or (page + 1) * TXLIST_PAGE_SIZE > MAX_RESULT_WINDOW:
             break
-
         
         page += 1
-        time.sleep(REQUEST_DELAY)
     
     return all_txs
 
 
-def extract_all_wallet_transactions(wallets, output_path, start_block, end_block, checkpoint_every=500, max_workers=4):
-    """Extract transactions for all wallets with PARALLEL processing."""
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+def get_transactions_in_range(address, start_block, end_block):
+    """Fetch all transactions for a wallet, splitting the block range past the 10k result window.
+    
+    Results are sorted by block, so when the window fills up every row before the
+    last returned block is complete. The rest of the range is re-fetched as two
+    halves in parallel (recursing again if a half is still too busy).
+    """
+    txs = get_transactions(address, start_block, end_block)
+    if len(txs) < MAX_RESULT_WINDOW:
+        return txs
+    
+    last_block = int(txs[-1]["blockNumber"])
+    if last_block <= start_block:
+        print(f"   ⚠️ {address[:10]}... has {len(txs):,}+ txs in block {start_block}, keeping first page window")
+        return txs
+    
+    # Keep rows from fully covered blocks, re-fetch the last (possibly partial) block onwards
+    complete = [tx for tx in txs if int(tx["blockNumber"]) < last_block]
+    mid = (last_block + end_block) // 2
+    ranges = [(last_block, mid), (mid + 1, end_block)] if mid < end_block else [(last_block, end_block)]
     
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        for part in executor.map(lambda r: get_transactions_in_range(address, *r), ranges):
+            complete.extend(part)
+    
+    return complete
+
+
+def cast_transaction_table(table):
+    """
+    Cast a table of API strings to TRANSACTION_SCHEMA (INT64_FIELDS as int64).
+    
+    Each integer column is cast in one pass when all of it parses. Otherwise
+    values that are not plain integers (e.g. "" from the API) are stored as
+    null instead of failing the whole extraction; the transform reads null
+    as 0, as it did for blank text.
+    
+    Args:
+        table: pyarrow Table with API_SCHEMA
+        
+    Returns:
+        pyarrow Table with TRANSACTION_SCHEMA
+    """
+    columns = []
+    for field in TRANSACTION_SCHEMA:
+        column = table.column(field.name)
+        if field.type != pa.int64():
+            columns.append(column)
+            continue
+        try:
+            columns.append(pc.cast(column, pa.int64()))
+        except pa.ArrowInvalid:
+            column = column.combine_chunks()
+            unparsable = pc.invert(pc.fill_null(pc.match_substring_regex(column, INT64_TEXT_PATTERN), True))
+            print(f"   ⚠️  {pc.sum(unparsable).as_py():,} unparsable {field.name} values stored as null")
+            # (replace_with_mask, not if_else with a null scalar: see load_to_database)
+            column = pc.replace_with_mask(column, unparsable, pa.nulls(len(column), pa.string()))
+            columns.append(pc.cast(column, pa.int64()))
+    return pa.Table.from_arrays(columns, schema=TRANSACTION_SCHEMA)
+
+
+def extract_all_wallet_transactions(wallets, output_path, start_block, end_block, checkpoint_every=500, max_workers=8):
+    """Extract transactions for all wallets with PARALLEL processing.
+    
+    Transactions are appended to a Parquet file as they arrive: each wallet's
+    rows become an Arrow RecordBatch right away (no growing list of dicts), and
+    every `checkpoint_every` wallets (or MAX_PENDING_ROWS rows, whichever
+    comes first) the pending batches are cast to the typed schema in one pass,
+    written as a new row group and dropped from memory, so memory and
+    checkpoint cost stay O(batch).
+    
+    Returns:
+        Number of transactions written
+    """
     output_path = Path(PROJECT_ROOT) / output_path
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    all_transactions = []
+    pending = []
+    pending_rows = 0
     total = len(wallets)
     processed = 0
+    total_txs = 0
     wallets_with_txs = 0
     
     print(f"📥 Extracting Linea transactions for {total:,} wallets")
@@ -187,40 +296,51 @@ def extract_all_wallet_transactions(wallets, output_path, start_block, end_block
     print(f"   Output: {output_path}")
     print("=" * 60)
     
+    def flush(writer):
+        nonlocal pending_rows
+        writer.write_table(cast_transaction_table(pa.Table.from_batches(pending, schema=API_SCHEMA)))
+        pending.clear()
+        pending_rows = 0
+    
     # Process in parallel batches
     def fetch_wallet(wallet):
-        return wallet, get_transactions(wallet, start_block, end_block)
+        return wallet, get_transactions_in_range(wallet, start_block, end_block)
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(fetch_wallet, w): w for w in wallets}
-        
-        for future in as_completed(futures):
-            wallet, txs = future.result()
-            processed += 1
-            
-            if txs:
-                all_transactions.extend(txs)
-                wallets_with_txs += 1
+    writer = pq.ParquetWriter(output_path, TRANSACTION_SCHEMA, compression="zstd")
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(fetch_wallet, w): w for w in wallets}
             
-            # Progress update every 100 wallets
-            if processed % 100 == 0 or processed == total:
-                print(f"   [{processed:,}/{total:,}] Wallets processed | {len(all_transactions):,} txs | {wallets_with_txs:,} active")
-            
-            # Checkpoint save
-            if processed % checkpoint_every == 0 and all_transactions:
-                df = pd.DataFrame(all_transactions)
-                df.to_csv(output_path, index=False)
-                print(f"   💾 Checkpoint saved: {len(df):,} rows")
+            for future in as_completed(futures):
+                wallet, txs = future.result()
+                processed += 1
+                
+                if txs:
+                    pending.append(pa.RecordBatch.from_pylist(txs, schema=API_SCHEMA))
+                    pending_rows += len(txs)
+                    total_txs += len(txs)
+                    wallets_with_txs += 1
+                
+                # Progress update every 100 wallets
+                if processed % 100 == 0 or processed == total:
+                    print(f"   [{processed:,}/{total:,}] Wallets processed | {total_txs:,} txs | {wallets_with_txs:,} active")
+                
+                # Checkpoint save (only the rows fetched since the last one)
+                if pending and (processed % checkpoint_every == 0 or pending_rows >= MAX_PENDING_ROWS):
+                    flush(writer)
+                    print(f"   💾 Checkpoint saved: {total_txs:,} rows")
+        
+        # Final save
+        if pending:
+            flush(writer)
+    finally:
+        writer.close()
     
-    # Final save
-    if all_transactions:
-        df = pd.DataFrame(all_transactions)
-        df.to_csv(output_path, index=False)
-        print(f"\n✅ Done! Saved {len(df):,} transactions from {wallets_with_txs:,} active wallets")
-        return df
+    if total_txs:
+        print(f"\n✅ Done! Saved {total_txs:,} transactions from {wallets_with_txs:,} active wallets")
     else:
         print("\n⚠️ No transactions found for any wallet")
-        return pd.DataFrame()
+    return total_txs
 
 
 # =============================================================================
@@ -254,14 +374,14 @@ if __name__ == "__main__":
     print(f"📋 Found {len(wallets):,} unique wallets to process")
     
     # Extract all transactions
-    output_file = f"{RAW_DATA_DIR}/linea_transactions.csv"
-    df = extract_all_wallet_transactions(
+    total_txs = extract_all_wallet_transactions(
         wallets, 
-        output_file,
+        LINEA_TXS_FILE,
         start_block=start_block,
         end_block=end_block
     )
     
-    if not df.empty:
+    if total_txs:
+        first_batch = next(pq.ParquetFile(Path(PROJECT_ROOT) / LINEA_TXS_FILE).iter_batches(batch_size=1))
         print(f"\n📄 Sample row:")
-        print(df.iloc[0].to_dict())
+        print(first_batch.to_pylist()[0])
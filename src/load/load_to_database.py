@@ -6,13 +6,18 @@ This is the bronze layer - stores cleaned/transformed data before dbt modeling.
 """
 
 import os
-from io import StringIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 from pathlib import Path
 import psycopg2
 from dotenv import load_dotenv
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import sys
+from itertools import chain
 
 # Add the project root to sys.path to allow imports from src
 current_dir = Path(__file__).resolve().parent
@@ -21,6 +26,7 @@ sys.path.append(str(project_root))
 
 # We import config via the full package path `src.utils.config`
 from src.utils.config import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+from src.utils.pg_copy import FLUSH_SIZE, write_frames_to_pg_binary, copy_from_producer
 
 # Load environment variables from .env so local runs work without exporting.
 load_dotenv()
@@ -28,6 +34,108 @@ load_dotenv()
 # Project root directory (3 levels up from this script)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
+# Table columns (in schema order) -> binary COPY wire type
+ETHERSCAN_LOGS_COLUMN_TYPES = {
+    'tx_hash': 'text',
+    'block_number': 'int8',
+    'timestamp': 'int8',
+    'datetime': 'timestamptz',
+    'from_address': 'text',
+    'to_address': 'text',
+    'message_hash': 'text',
+    'value_eth': 'numeric',
+    'fee_eth': 'numeric',
+    'nonce': 'int8',
+    'gas_price': 'int8',
+    'gas_used': 'int8',
+    'log_index': 'int4',
+    'tx_index': 'int4',
+}
+
+LINEA_TRANSACTIONS_COLUMN_TYPES = {
+    'datetime': 'timestamptz',
+    'block_number': 'int8',
+    'hash': 'text',
+    'from_address': 'text',
+    'to_address': 'text',
+    'value_eth': 'numeric',
+    'gas_price_gwei': 'numeric',
+    'gas_used_int': 'int8',
+    'nonce_int': 'int4',
+    'is_error': 'bool',
+    'tx_status': 'bool',
+    'method_id': 'text',
+    'function_name': 'text',
+}
+
+# Map column names (CSV uses 'from'/'to', table uses 'from_address'/'to_address')
+LINEA_TRANSACTIONS_COLUMN_MAPPING = {
+    'from': 'from_address',
+    'to': 'to_address',
+    'methodId': 'method_id',
+    'functionName': 'function_name'
+}
+
+# CSV column name -> wire type for each table (resolved once, not per file).
+# Logs skip the datetime text column: it is rebuilt from the integer epoch
+# `timestamp`, which is cheaper than parsing timestamp strings.
+ETHERSCAN_LOGS_CSV_TYPES = {
+    col: pg_type for col, pg_type in ETHERSCAN_LOGS_COLUMN_TYPES.items() if col != 'datetime'
+}
+_TABLE_TO_CSV_COLUMN = {table_col: csv_col for csv_col, table_col in LINEA_TRANSACTIONS_COLUMN_MAPPING.items()}
+LINEA_TRANSACTIONS_CSV_TYPES = {
+    _TABLE_TO_CSV_COLUMN.get(col, col): pg_type for col, pg_type in LINEA_TRANSACTIONS_COLUMN_TYPES.items()
+}
+
+# Wire type -> Arrow type the CSV column is parsed as. Pinned types keep all
+# streamed blocks consistent (inference would only see the first block, e.g.
+# an all-empty functionName block). Timestamps are still inferred, as files
+# carry either naive or offset-suffixed values.
+CSV_ARROW_TYPES = {
+    'int8': pa.int64(),
+    'int4': pa.int32(),
+    'bool': pa.bool_(),
+    'numeric': pa.float64(),
+    'text': pa.string(),
+}
+
+# Arrow type -> pandas nullable dtype. Integer/bool columns with missing
+# values stay integer/bool (<NA> instead of float64 / object), so nothing is
+# re-cast before encoding.
+NULLABLE_DTYPES = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.int32(): pd.Int32Dtype(),
+    pa.bool_(): pd.BooleanDtype(),
+    pa.float64(): pd.Float64Dtype(),
+}
+
+# CSV bytes parsed per block by the pandas fallback (~90k log rows), which
+# bounds its memory instead of materializing the whole file
+CSV_BLOCK_SIZE = 32 * 1024 * 1024
+
+# Rows per record batch read from a transformed Parquet file (bounds memory
+# like CSV_BLOCK_SIZE does for CSV)
+PARQUET_BATCH_ROWS = 100_000
+
+# Secondary indexes per raw table (index name -> column). A full reload drops
+# them before COPY and rebuilds them afterwards: one sorted bulk build per
+# index is much cheaper than a B-tree insert per loaded row.
+TABLE_INDEXES = {
+    'etherscan_logs': {
+        'idx_etherscan_logs_from_address': 'from_address',
+        'idx_etherscan_logs_datetime': 'datetime',
+        'idx_etherscan_logs_block_number': 'block_number',
+    },
+    'linea_transactions': {
+        'idx_linea_txs_from_address': 'from_address',
+        'idx_linea_txs_datetime': 'datetime',
+        'idx_linea_txs_block_number': 'block_number',
+    },
+}
+
+# Sort memory for the post-load index builds (session default is 64MB)
+INDEX_BUILD_MEMORY = '256MB'
+
 def get_db_connection(
     host: Optional[str] = None,
     port: Optional[str] = None,
@@ -61,11 +169,14 @@ def create_etherscan_logs_table(conn) -> None:
     
     This table stores transformed bridge deposit events from Ethereum Mainnet.
     Columns match the output from transform_logs.py.
+    
+    UNLOGGED: the raw layer is fully reloaded from files, so WAL writes during
+    bulk COPY are pure overhead (contents are emptied after a crash).
     """
     create_sql = """
     CREATE SCHEMA IF NOT EXISTS raw;
     
-    CREATE TABLE IF NOT EXISTS raw.etherscan_logs (
+    CREATE UNLOGGED TABLE IF NOT EXISTS raw.etherscan_logs (
         tx_hash VARCHAR(66) NOT NULL,
         block_number BIGINT NOT NULL,
         timestamp BIGINT NOT NULL,
@@ -84,14 +195,14 @@ def create_etherscan_logs_table(conn) -> None:
         PRIMARY KEY (tx_hash, log_index)
     );
     
-    -- Create indexes for common queries
-    CREATE INDEX IF NOT EXISTS idx_etherscan_logs_from_address ON raw.etherscan_logs(from_address);
-    CREATE INDEX IF NOT EXISTS idx_etherscan_logs_datetime ON raw.etherscan_logs(datetime);
-    CREATE INDEX IF NOT EXISTS idx_etherscan_logs_block_number ON raw.etherscan_logs(block_number);
+    -- Convert tables created before the UNLOGGED switch (no-op once unlogged)
+    ALTER TABLE raw.etherscan_logs SET UNLOGGED;
     """
     
     with conn.cursor() as cur:
         cur.execute(create_sql)
+    # Create indexes for common queries
+    create_indexes(conn, "etherscan_logs")
     conn.commit()
     print("✓ Table raw.etherscan_logs created/verified")
 
@@ -102,12 +213,17 @@ def create_transactions_table(conn) -> None:
     
     This table stores transformed Linea network transactions.
     Columns match the output from transform_transactions.py.
+    
+    UNLOGGED: the raw layer is fully reloaded from files, so WAL writes during
+    bulk COPY are pure overhead (contents are emptied after a crash).
+    
+    An existing table is kept (not dropped and recreated), so its contents
+    and the loaded-file fingerprint in its comment survive between runs.
     """
     create_sql = """
     CREATE SCHEMA IF NOT EXISTS raw;
     
-    DROP TABLE IF EXISTS raw.linea_transactions CASCADE;
-    CREATE TABLE IF NOT EXISTS raw.linea_transactions (
+    CREATE UNLOGGED TABLE IF NOT EXISTS raw.linea_transactions (
         datetime TIMESTAMP WITH TIME ZONE NOT NULL,
         block_number BIGINT NOT NULL,
         hash VARCHAR(66) NOT NULL PRIMARY KEY,
@@ -124,19 +240,42 @@ def create_transactions_table(conn) -> None:
         loaded_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
     );
     
-    -- Create indexes for common queries
-    CREATE INDEX IF NOT EXISTS idx_linea_txs_from_address ON raw.linea_transactions(from_address);
-    CREATE INDEX IF NOT EXISTS idx_linea_txs_datetime ON raw.linea_transactions(datetime);
-    CREATE INDEX IF NOT EXISTS idx_linea_txs_block_number ON raw.linea_transactions(block_number);
+    -- Convert tables created before the UNLOGGED switch (no-op once unlogged)
+    ALTER TABLE raw.linea_transactions SET UNLOGGED;
     """
     
     with conn.cursor() as cur:
         cur.execute(create_sql)
+    # Create indexes for common queries
+    create_indexes(conn, "linea_transactions")
     conn.commit()
     print("✓ Table raw.linea_transactions created/verified")
 
 
-def truncate_table(conn, table_name: str) -> None:
+def drop_indexes(conn, table_name: str) -> None:
+    """
+    Drop the secondary indexes of a raw table (see TABLE_INDEXES).
+    
+    Does not commit: run it in the same transaction as the TRUNCATE and the
+    load, so a failed load or index rebuild rolls the indexes back too.
+    """
+    with conn.cursor() as cur:
+        for index_name in TABLE_INDEXES[table_name]:
+            cur.execute(f"DROP INDEX IF EXISTS raw.{index_name};")
+
+
+def create_indexes(conn, table_name: str) -> None:
+    """
+    Create the secondary indexes of a raw table if missing (see TABLE_INDEXES).
+    
+    Does not commit; the caller commits together with its other changes.
+    """
+    with conn.cursor() as cur:
+        for index_name, column in TABLE_INDEXES[table_name].items():
+            cur.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON raw.{table_name}({column});")
+
+
+def truncate_table(conn, table_name: str, commit: bool = True) -> None:
     """
     Remove all rows from a raw table (keeps table structure).
     Use for full refresh strategy.
@@ -144,71 +283,220 @@ def truncate_table(conn, table_name: str) -> None:
     Args:
         conn: PostgreSQL connection
         table_name: Name of table to truncate (without schema prefix)
+        commit: If False, leave the TRUNCATE open so the following COPY
+            commits (or rolls back) together with it
     """
     with conn.cursor() as cur:
         cur.execute(f"TRUNCATE TABLE raw.{table_name};")
-    conn.commit()
+    if commit:
+        conn.commit()
     print(f"✓ Truncated raw.{table_name}")
 
 
-def load_etherscan_logs_csv(conn, csv_path: Path) -> int:
+def iter_transformed_csv(csv_path: Path, csv_types: dict):
     """
-    Load transformed etherscan logs CSV file into PostgreSQL.
+    Stream the wanted columns of a transformed CSV as DataFrames of one block each.
+    
+    Blocks of CSV_BLOCK_SIZE bytes are parsed by pyarrow's streaming reader,
+    so memory stays bounded by the block size whatever the file size. The
+    header is read first and intersected with `csv_types` (extra CSV columns
+    are skipped at parse time, missing ones are simply absent). Numeric and
+    boolean columns come out as pandas nullable dtypes, so empty fields become
+    <NA> without changing the column type; empty text fields become None.
+    
+    Args:
+        csv_path: Path to the transformed CSV file
+        csv_types: CSV column name -> wire type (see *_CSV_TYPES)
+        
+    Yields:
+        DataFrame per block with the wanted columns present in the file
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [col for col in header if col in csv_types]
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=usecols,
+        column_types={
+            col: CSV_ARROW_TYPES[csv_types[col]] for col in usecols
+            if csv_types[col] in CSV_ARROW_TYPES
+        },
+        strings_can_be_null=True
+    )
     
-    Uses COPY for fast bulk loading. Handles data type conversions and NULLs.
+    reader = pa_csv.open_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        convert_options=convert_options
+    )
+    for batch in reader:
+        if batch.num_rows:
+            yield batch.to_pandas(types_mapper=NULLABLE_DTYPES.get)
+
+
+def iter_transformed_parquet(parquet_path: Path, csv_types: dict):
+    """
+    Stream the wanted columns of a transformed Parquet file as DataFrames.
+    
+    Record batches of PARQUET_BATCH_ROWS rows are read one at a time. Column
+    types come from the file, so nothing is parsed from text. Like
+    iter_transformed_csv, columns missing from the file are simply absent,
+    numeric/boolean columns come out as pandas nullable dtypes and empty
+    text becomes None (so both formats load the same rows).
+    
+    Args:
+        parquet_path: Path to the transformed Parquet file
+        csv_types: Column name -> wire type (see *_CSV_TYPES)
+        
+    Yields:
+        DataFrame per record batch with the wanted columns present in the file
+    """
+    parquet_file = pq.ParquetFile(parquet_path)
+    columns = [col for col in parquet_file.schema_arrow.names if col in csv_types]
+    for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_ROWS, columns=columns):
+        if batch.num_rows:
+            # Categorical text is stored dictionary-encoded: decode it to plain strings
+            arrays = [
+                array.dictionary_decode() if pa.types.is_dictionary(array.type) else array
+                for array in batch.columns
+            ]
+            # (replace_with_mask, not if_else with a null scalar: the latter
+            # corrupts offsets of sliced string arrays in pyarrow 15)
+            arrays = [
+                pc.replace_with_mask(array, pc.equal(array, ""), pa.nulls(len(array), array.type))
+                if pa.types.is_string(array.type) else array
+                for array in arrays
+            ]
+            batch = pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+            yield batch.to_pandas(types_mapper=NULLABLE_DTYPES.get)
+
+
+def csv_table_columns(csv_path: Path, column_types: dict, column_mapping: Optional[dict] = None) -> Optional[list]:
+    """
+    Map a CSV header onto table columns for a direct file COPY.
+    
+    COPY matches CSV fields to its column list by position, so renamed
+    columns only need their table name in that list.
+    
+    Args:
+        csv_path: Path to the transformed CSV file
+        column_types: Table columns (see *_COLUMN_TYPES)
+        column_mapping: CSV column name -> table column name, where they differ
+        
+    Returns:
+        Table column for each CSV column in file order, or None when some CSV
+        column has no table column (the file then goes through pandas)
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    mapping = column_mapping or {}
+    columns = [mapping.get(col, col) for col in header]
+    if all(col in column_types for col in columns):
+        return columns
+    return None
+
+
+def copy_csv_file(conn, csv_path: Path, table_name: str, columns: list, freeze: bool = False, commit: bool = True) -> int:
+    """
+    Stream a CSV file straight from disk into COPY ... (FORMAT CSV).
+    
+    Postgres parses the file itself: nothing is materialized or re-encoded
+    client-side, and only one read buffer of the file is in memory at a time.
+    Unquoted empty fields load as NULL, and timestamps without an offset are
+    read as UTC (as the pandas path does), whatever the server's TimeZone.
     
     Args:
         conn: PostgreSQL connection
-        csv_path: Path to transformed_logs.csv file
+        csv_path: Path to the CSV file (with header row)
+        table_name: Target table (without schema prefix)
+        columns: Table column for each CSV column, in file order
+        freeze: COPY with FREEZE (see load_etherscan_logs_csv)
+        commit: If False, leave the COPY open for the caller to commit
         
     Returns:
         Number of rows inserted
     """
-    print(f"📥 Reading {csv_path.name}...")
-    df = pd.read_csv(csv_path)
+    copy_sql = f"""
+        COPY raw.{table_name} ({", ".join(columns)})
+        FROM STDIN WITH (FORMAT CSV, HEADER TRUE{", FREEZE" if freeze else ""})
+    """
     
-    if df.empty:
-        print("   ⚠️  CSV file is empty, skipping.")
-        return 0
+    print(f"📥 Streaming {csv_path.name} into raw.{table_name}...")
+    try:
+        with conn.cursor() as cur, open(csv_path, "rb") as f:
+            cur.execute("SET LOCAL TimeZone = 'UTC';")
+            cur.copy_expert(copy_sql, f, size=FLUSH_SIZE)
+            inserted = cur.rowcount
+        if commit:
+            conn.commit()
+        
+        print(f"   ✓ Loaded {inserted:,} rows into raw.{table_name}")
+        return inserted
+    except Exception as e:
+        conn.rollback()
+        print(f"   ❌ Error loading {table_name}: {e}")
+        raise
+
+
+def load_etherscan_logs_csv(conn, csv_path: Path, freeze: bool = False, commit: bool = True) -> int:
+    """
+    Load transformed etherscan logs CSV file into PostgreSQL.
     
-    print(f"   Found {len(df):,} rows")
+    When every CSV column exists in the table, the file is streamed straight
+    into COPY (see copy_csv_file). Otherwise it is read block by block with
+    pandas and sent as one binary COPY stream, which handles data type
+    conversions and NULLs without holding the whole file in memory.
     
-    # Ensure datetime column is properly typed
-    if 'datetime' in df.columns:
-        df['datetime'] = pd.to_datetime(df['datetime'], utc=True)
+    Args:
+        conn: PostgreSQL connection
+        csv_path: Path to transformed_logs.csv file
+        freeze: COPY with FREEZE (rows written pre-frozen, no later vacuum
+            freeze pass). Only valid when the table was truncated or created
+            in the current transaction.
+        commit: If False, leave the COPY open so the caller commits (or rolls
+            back) it together with its own follow-up changes
+        
+    Returns:
+        Number of rows inserted
+    """
+    table_columns = csv_table_columns(csv_path, ETHERSCAN_LOGS_COLUMN_TYPES)
+    if table_columns is not None:
+        return copy_csv_file(conn, csv_path, 'etherscan_logs', table_columns, freeze, commit)
     
-    # Replace NaN with None for PostgreSQL NULL handling
-    df = df.where(pd.notnull(df), None)
+    print(f"📥 Streaming {csv_path.name} in {CSV_BLOCK_SIZE // (1024 * 1024)}MB blocks...")
+    chunks = iter_transformed_csv(csv_path, ETHERSCAN_LOGS_CSV_TYPES)
+    first = next(chunks, None)
     
-    # Prepare columns in correct order matching table schema
-    columns = [
-        'tx_hash', 'block_number', 'timestamp', 'datetime',
-        'from_address', 'to_address', 'message_hash',
-        'value_eth', 'fee_eth', 'nonce',
-        'gas_price', 'gas_used', 'log_index', 'tx_index'
-    ]
+    if first is None:
+        print("   ⚠️  CSV file is empty, skipping.")
+        return 0
     
-    # Select only columns that exist in dataframe
-    available_cols = [col for col in columns if col in df.columns]
-    df_selected = df[available_cols].copy()
+    def frames():
+        for df in chain([first], chunks):
+            # Typed timestamptz straight from the epoch seconds (no string parsing)
+            df['datetime'] = pd.to_datetime(df['timestamp'], unit='s', utc=True)
+            yield df
     
-    # Stream DataFrame to CSV in-memory for COPY
-    buffer = StringIO()
-    df_selected.to_csv(buffer, index=False, header=False, na_rep='\\N')
-    buffer.seek(0)
+    # Select only columns that exist in the file (<NA>/NaT are encoded as NULL)
+    column_types = {
+        col: pg_type for col, pg_type in ETHERSCAN_LOGS_COLUMN_TYPES.items()
+        if col in first.columns or col == 'datetime'
+    }
     
     # Use COPY for fast bulk insert
     copy_sql = f"""
-        COPY raw.etherscan_logs ({", ".join(available_cols)})
-        FROM STDIN WITH (FORMAT CSV, NULL '\\N')
+        COPY raw.etherscan_logs ({", ".join(column_types)})
+        FROM STDIN WITH (FORMAT BINARY{", FREEZE" if freeze else ""})
     """
     
     try:
+        # Parse and encode block by block on a background thread, streamed
+        # through a pipe into a single COPY
         with conn.cursor() as cur:
-            cur.copy_expert(sql=copy_sql, file=buffer)
-        conn.commit()
+            inserted = copy_from_producer(
+                cur, copy_sql,
+                lambda sink: write_frames_to_pg_binary(frames(), column_types, sink)
+            )
+        if commit:
+            conn.commit()
         
-        inserted = len(df_selected)
         print(f"   ✓ Loaded {inserted:,} rows into raw.etherscan_logs")
         return inserted
     except Exception as e:
@@ -217,77 +505,73 @@ def load_etherscan_logs_csv(conn, csv_path: Path) -> int:
         raise
 
 
-def load_transactions_csv(conn, csv_path: Path) -> int:
+def load_transactions_csv(conn, csv_path: Path, freeze: bool = False, commit: bool = True) -> int:
     """
-    Load transformed transactions CSV file into PostgreSQL.
+    Load transformed transactions (Parquet or CSV) into PostgreSQL.
     
-    Uses COPY for fast bulk loading. Handles data type conversions and NULLs.
+    A Parquet file is read batch by batch with its stored types. For a CSV,
+    when every column exists in the table, the file is streamed straight
+    into COPY (see copy_csv_file); otherwise it is read block by block with
+    pandas. Frames are sent as one binary COPY stream, which handles data
+    type conversions and NULLs without holding the whole file in memory.
     
     Args:
         conn: PostgreSQL connection
-        csv_path: Path to transformed_transactions.csv file
+        csv_path: Path to transformed_transactions.parquet (or .csv) file
+        freeze: COPY with FREEZE (rows written pre-frozen, no later vacuum
+            freeze pass). Only valid when the table was truncated or created
+            in the current transaction.
+        commit: If False, leave the COPY open so the caller commits (or rolls
+            back) it together with its own follow-up changes
         
     Returns:
         Number of rows inserted
     """
-    print(f"📥 Reading {csv_path.name}...")
-    df = pd.read_csv(csv_path)
+    if csv_path.suffix == '.parquet':
+        print(f"📥 Streaming {csv_path.name} in {PARQUET_BATCH_ROWS:,}-row batches...")
+        chunks = iter_transformed_parquet(csv_path, LINEA_TRANSACTIONS_CSV_TYPES)
+    else:
+        table_columns = csv_table_columns(csv_path, LINEA_TRANSACTIONS_COLUMN_TYPES, LINEA_TRANSACTIONS_COLUMN_MAPPING)
+        if table_columns is not None:
+            return copy_csv_file(conn, csv_path, 'linea_transactions', table_columns, freeze, commit)
+        
+        print(f"📥 Streaming {csv_path.name} in {CSV_BLOCK_SIZE // (1024 * 1024)}MB blocks...")
+        chunks = iter_transformed_csv(csv_path, LINEA_TRANSACTIONS_CSV_TYPES)
+    first = next(chunks, None)
     
-    if df.empty:
-        print("   ⚠️  CSV file is empty, skipping.")
+    if first is None:
+        print(f"   ⚠️  {csv_path.name} is empty, skipping.")
         return 0
     
-    print(f"   Found {len(df):,} rows")
-    
-    # Ensure datetime column is properly typed
-    if 'datetime' in df.columns:
-        df['datetime'] = pd.to_datetime(df['datetime'], utc=True)
+    def frames():
+        for df in chain([first], chunks):
+            # Relabel in place (rename() would copy every column)
+            df.columns = [LINEA_TRANSACTIONS_COLUMN_MAPPING.get(col, col) for col in df.columns]
+            yield df
     
-    # Replace NaN with None for PostgreSQL NULL handling
-    df = df.where(pd.notnull(df), None)
-    
-    # Prepare columns in correct order matching table schema
-    columns = [
-        'datetime', 'block_number', 'hash', 'from', 'to',
-        'value_eth', 'gas_price_gwei', 'gas_used_int', 'nonce_int',
-        'is_error', 'tx_status', 'methodId', 'functionName'
-    ]
-    
-    # Map column names (CSV uses 'from'/'to', table uses 'from_address'/'to_address')
-    column_mapping = {
-        'from': 'from_address',
-        'to': 'to_address',
-        'methodId': 'method_id',
-        'functionName': 'function_name'
+    # Select only columns that exist in the file (<NA>/NaT are encoded as NULL)
+    column_types = {
+        col: pg_type for col, pg_type in LINEA_TRANSACTIONS_COLUMN_TYPES.items()
+        if _TABLE_TO_CSV_COLUMN.get(col, col) in first.columns
     }
     
-    # Select only columns that exist in dataframe
-    available_cols = [col for col in columns if col in df.columns]
-    df_selected = df[available_cols].copy()
-    
-    # Rename columns to match table schema
-    df_selected = df_selected.rename(columns=column_mapping)
-    
-    # Stream DataFrame to CSV in-memory for COPY
-    buffer = StringIO()
-    df_selected.to_csv(buffer, index=False, header=False, na_rep='\\N')
-    buffer.seek(0)
-    
-    # Get final column names after renaming
-    final_cols = [column_mapping.get(col, col) for col in available_cols]
-    
     # Use COPY for fast bulk insert
     copy_sql = f"""
-        COPY raw.linea_transactions ({", ".join(final_cols)})
-        FROM STDIN WITH (FORMAT CSV, NULL '\\N')
+        COPY raw.linea_transactions ({", ".join(column_types)})
+        FROM STDIN WITH (FORMAT BINARY{", FREEZE" if freeze else ""})
     """
     
     try:
+        # Parse and encode block by block on a background thread, streamed
+        # through a pipe into a single COPY
         with conn.cursor() as cur:
-            cur.copy_expert(sql=copy_sql, file=buffer)
-        conn.commit()
+            inserted = copy_from_producer(
+                cur, copy_sql,
+                lambda sink: write_frames_to_pg_binary(frames(), column_types, sink)
+            )
+        if commit:
+            conn.commit()
         
-        inserted = len(df_selected)
         print(f"   ✓ Loaded {inserted:,} rows into raw.linea_transactions")
         return inserted
     except Exception as e:
@@ -296,13 +580,17 @@ def load_transactions_csv(conn, csv_path: Path) -> int:
         raise
 
 
-def check_table_status(conn, table_name: str) -> dict:
+def check_table_status(conn, table_name: str, exact: bool = False) -> dict:
     """
     Check if table exists and return row count.
     
+    Existence and the planner's row estimate (pg_class.reltuples) come from one
+    catalog lookup; the full-scan COUNT(*) only runs when exact=True.
+    
     Args:
         conn: psycopg2 connection
         table_name: Name of the table to check (without schema prefix)
+        exact: If True, count rows with COUNT(*) instead of using the estimate
     
     Returns:
         Dictionary with 'exists' (bool) and 'row_count' (int)
@@ -313,18 +601,17 @@ def check_table_status(conn, table_name: str) -> dict:
     }
     
     with conn.cursor() as cur:
-        # Check if table exists
+        # Existence + estimated rows (reltuples is -1 until the table is analyzed)
         cur.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = 'raw' 
-                AND table_name = %s
-            );
-        """, (table_name,))
-        table_exists = cur.fetchone()[0]
+            SELECT r.oid IS NOT NULL, COALESCE(GREATEST(c.reltuples, 0), 0)::bigint
+            FROM (SELECT to_regclass(%s) AS oid) r
+            LEFT JOIN pg_class c ON c.oid = r.oid;
+        """, (f"raw.{table_name}",))
+        table_exists, estimated_rows = cur.fetchone()
         result["exists"] = table_exists
+        result["row_count"] = estimated_rows
         
-        if not table_exists:
+        if not table_exists or not exact:
             return result
         
         # Count total rows
@@ -334,21 +621,110 @@ def check_table_status(conn, table_name: str) -> dict:
     return result
 
 
+def file_fingerprint(path: Path) -> str:
+    """Identify a source file version by name, size and modification time."""
+    stat = path.stat()
+    return f"source_file={path.name} size={stat.st_size} mtime_ns={stat.st_mtime_ns}"
+
+
+def get_loaded_fingerprint(conn, table_name: str) -> Optional[str]:
+    """
+    Return the fingerprint of the file last loaded into a raw table.
+    
+    Stored as the table comment, so it is dropped together with the table
+    and rolled back with a failed load. The catalog is WAL-logged, though:
+    crash recovery empties an UNLOGGED table but keeps its comment, so an
+    empty table reports no fingerprint (and gets reloaded).
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT obj_description(to_regclass(%s), 'pg_class');", (f"raw.{table_name}",))
+        fingerprint = cur.fetchone()[0]
+        if fingerprint is None:
+            return None
+        cur.execute(f"SELECT EXISTS (SELECT 1 FROM raw.{table_name});")
+        return fingerprint if cur.fetchone()[0] else None
+
+
+def load_table_on_own_connection(
+    table_name: str,
+    loader,
+    csv_path: Path,
+    truncate_existing: bool,
+    full_refresh: bool = False
+) -> int:
+    """
+    Truncate (optionally) and load one raw table on a dedicated connection.
+    
+    COPY is CPU-bound on a single backend, so each table gets its own
+    connection and both loads run concurrently on separate backends.
+    TRUNCATE, COPY, the index rebuild and the fingerprint comment share one
+    transaction: a single commit per table, and a failure at any step rolls
+    back to the previous contents and indexes instead of an empty table.
+    On a truncating load the secondary indexes are dropped with the TRUNCATE
+    and rebuilt in bulk once the rows are in.
+    
+    Args:
+        table_name: Name of table to load (without schema prefix)
+        loader: load_*_csv function taking (conn, csv_path, freeze, commit)
+        csv_path: Path to the transformed CSV file
+        truncate_existing: If True, truncate the table before loading
+        full_refresh: If False, skip the load when the table already holds
+            this exact file version (same name, size and mtime)
+        
+    Returns:
+        Number of rows inserted (0 when skipped)
+    """
+    conn = get_db_connection()
+    try:
+        fingerprint = file_fingerprint(csv_path)
+        if not full_refresh and get_loaded_fingerprint(conn, table_name) == fingerprint:
+            print(f"⏭️  raw.{table_name} already holds {csv_path.name} (unchanged), skipping")
+            return 0
+        
+        if truncate_existing:
+            truncate_table(conn, table_name, commit=False)
+            # Bulk-build secondary indexes after COPY instead of maintaining them per row
+            drop_indexes(conn, table_name)
+        # FREEZE is only legal right after a TRUNCATE in the same transaction
+        rows = loader(conn, csv_path, freeze=truncate_existing, commit=False)
+        
+        with conn.cursor() as cur:
+            cur.execute(f"SET LOCAL maintenance_work_mem = '{INDEX_BUILD_MEMORY}';")
+        create_indexes(conn, table_name)
+        
+        # Record which file version the table now holds, then commit everything at once
+        with conn.cursor() as cur:
+            cur.execute(f"COMMENT ON TABLE raw.{table_name} IS %s;", (fingerprint,))
+        conn.commit()
+        
+        # Refresh planner stats (also the row estimate check_table_status reads)
+        with conn.cursor() as cur:
+            cur.execute(f"ANALYZE raw.{table_name};")
+        conn.commit()
+        return rows
+    finally:
+        conn.close()
+
 
 def load_all_transformed_data(
     transformed_dir: Optional[Path] = None,
-    truncate_existing: bool = True
+    truncate_existing: bool = True,
+    full_refresh: bool = False
 ) -> dict:
     """
-    Main function to load all transformed CSV files into PostgreSQL.
+    Main function to load all transformed files into PostgreSQL.
     
     Loads:
-    - transformed_logs.csv → raw.bridge_logs
-    - transformed_transactions.csv → raw.linea_transactions
+    - transformed_logs.csv → raw.etherscan_logs
+    - transformed_transactions.parquet (or .csv) → raw.linea_transactions
+    
+    Tables are loaded concurrently, each on its own connection. A table that
+    already holds the current version of its file is skipped.
     
     Args:
-        transformed_dir: Directory containing transformed CSV files (default: data/transformed)
+        transformed_dir: Directory containing transformed files (default: data/transformed)
         truncate_existing: If True, truncate tables before loading (full refresh)
+        full_refresh: If True, reload files even when they are unchanged since the last load
         
     Returns:
         Dictionary with 'bridge_logs' and 'transactions' row counts
@@ -364,7 +740,10 @@ def load_all_transformed_data(
     
     # Define expected files
     bridge_logs_file = transformed_dir / "transformed_logs.csv"
-    transactions_file = transformed_dir / "transformed_transactions.csv"
+    # The transactions transformer writes Parquet; CSV from older runs still loads
+    transactions_file = transformed_dir / "transformed_transactions.parquet"
+    if not transactions_file.exists():
+        transactions_file = transactions_file.with_suffix(".csv")
     
     # Open database connection
     conn = get_db_connection()
@@ -384,57 +763,53 @@ def load_all_transformed_data(
         create_transactions_table(conn)
         
         # =====================================================================
-        # 2. LOAD BRIDGE LOGS
+        # 2. LOAD BRIDGE LOGS + TRANSACTIONS (in parallel, one connection each)
         # =====================================================================
+        jobs = {}
+        
         if bridge_logs_file.exists():
-            print(f"\n📊 Loading Bridge Logs")
-            print("-" * 60)
-            
-            if truncate_existing:
-                truncate_table(conn, "etherscan_logs")
-            
-            try:
-                rows = load_etherscan_logs_csv(conn, bridge_logs_file)
-                results["etherscan_logs"] = rows
-            except Exception as e:
-                print(f"❌ Failed to load bridge logs: {e}")
-                conn.rollback()
+            jobs["bridge_logs"] = ("etherscan_logs", load_etherscan_logs_csv, bridge_logs_file)
         else:
             print(f"\n⚠️  Bridge logs file not found: {bridge_logs_file}")
         
-        # =====================================================================
-        # 3. LOAD TRANSACTIONS
-        # =====================================================================
         if transactions_file.exists():
-            print(f"\n📊 Loading Linea Transactions")
-            print("-" * 60)
-            
-            if truncate_existing:
-                truncate_table(conn, "linea_transactions")
-            
-            try:
-                rows = load_transactions_csv(conn, transactions_file)
-                results["transactions"] = rows
-            except Exception as e:
-                print(f"❌ Failed to load transactions: {e}")
-                conn.rollback()
+            jobs["transactions"] = ("linea_transactions", load_transactions_csv, transactions_file)
         else:
             print(f"\n⚠️  Transactions file not found: {transactions_file}")
         
+        if jobs:
+            print(f"\n📊 Loading {', '.join(table for table, _, _ in jobs.values())} in parallel")
+            print("-" * 60)
+            
+            with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                futures = {
+                    executor.submit(
+                        load_table_on_own_connection, table, loader, path, truncate_existing, full_refresh
+                    ): key
+                    for key, (table, loader, path) in jobs.items()
+                }
+                
+                for future in as_completed(futures):
+                    key = futures[future]
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        print(f"❌ Failed to load {jobs[key][0]}: {e}")
+        
         # =====================================================================
-        # 4. SUMMARY
+        # 3. SUMMARY
         # =====================================================================
         print("\n" + "=" * 60)
         print("✅ Loading Complete!")
         print("=" * 60)
         
-        # Check final row counts
+        # Check final row counts (planner estimates, refreshed by ANALYZE after each load)
         bridge_status = check_table_status(conn, "etherscan_logs")
         tx_status = check_table_status(conn, "linea_transactions")
         
         print(f"\n📈 Final Table Status:")
-        print(f"   raw.etherscan_logs: {bridge_status['row_count']:,} rows")
-        print(f"   raw.linea_transactions: {tx_status['row_count']:,} rows")
+        print(f"   raw.etherscan_logs: ~{bridge_status['row_count']:,} rows")
+        print(f"   raw.linea_transactions: ~{tx_status['row_count']:,} rows")
         
         return results
         
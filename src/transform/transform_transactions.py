@@ -2,10 +2,20 @@
 Transaction Transformer
 =======================
 Cleans and converts raw Linea transactions for analysis.
+
+Every conversion is column-wise; the `_scalar_*` helpers are row-at-a-time
+references kept for unit tests.
 """
 
+import os
 import sys
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -14,126 +24,463 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / "src"))
 
 from utils.config import LINEA_TXS_FILE, PROCESSED_DATA_DIR
+from utils.hex_utils import hex_series_to_int64, hex_words_to_float64
+
+
+# Text accepted by the vectorized converters (after trimming whitespace):
+# 0x-prefixed hex, or a decimal/scientific number as float() would parse it
+HEX_PATTERN = r"^0[xX][0-9a-fA-F]+$"
+DECIMAL_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+
+# Plain decimal integers that always fit int64: parsed exactly, not via float
+INTEGER_PATTERN = r"^[+-]?\d{1,18}$"
+
+# Raw txlist columns the transform reads. Everything else (notably the
+# calldata in `input`, by far the widest column) is never loaded.
+RAW_COLUMNS = [
+    "hash", "timeStamp", "value", "gasPrice", "blockNumber", "nonce", "gasUsed",
+    "isError", "txreceipt_status", "from", "to", "methodId", "functionName"
+]
+
+# Raw rows read and transformed per batch by transform_transactions_file
+TRANSFORM_BATCH_ROWS = 500_000
+
+# Output text columns with heavy repetition (the same contracts, EOAs and
+# methods recur thousands of times), stored as categoricals
+CATEGORICAL_COLUMNS = ["from", "to", "methodId", "functionName"]
+
+# Parquet dictionary type the categoricals are written as
+TEXT_DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+
+# Output columns, in order -> Parquet type. Pinned so every batch is written
+# with the same schema (inference would type an all-null `to` batch as null).
+OUTPUT_TYPES = {
+    "datetime": pa.timestamp("ns"),
+    "block_number": pa.int64(),
+    "hash": pa.string(),
+    "from": TEXT_DICTIONARY,
+    "to": TEXT_DICTIONARY,
+    "value_eth": pa.float64(),
+    "gas_price_gwei": pa.float64(),
+    "gas_used_int": pa.int64(),
+    "nonce_int": pa.int64(),
+    "is_error": pa.bool_(),
+    "tx_status": pa.bool_(),
+    "methodId": TEXT_DICTIONARY,
+    "functionName": TEXT_DICTIONARY,
+}
+
+OUTPUT_COLUMNS = tuple(OUTPUT_TYPES)
+
+# Wei per unit (float: converted amounts are float64)
+WEI_PER_ETH = 1e18
+WEI_PER_GWEI = 1e9
 
 
 # =============================================================================
 # FUNCTIONS
 # =============================================================================
 
-def hex_to_int(hex_str):
-    """Convert hex string (or numeric string) to integer."""
-    if pd.isna(hex_str):
-        return 0
+def _numeric_text(series):
+    """Text column as a pyarrow string array."""
+    try:
+        return pa.array(series, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed object column (e.g. Python ints among strings)
+        return pa.array(series.astype(str).where(series.notna()), type=pa.string(), from_pandas=True)
+
+
+def _cast_clean_text(text, arrow_type):
+    """
+    Convert a whole text column with a single Arrow cast, if it is clean.
     
-    str_val = str(hex_str).strip()
-    if str_val == "0x" or str_val == "":
-        return 0
-        
+    Arrow's integer cast parses decimal and 0x-hex digits natively and its
+    float cast is correctly rounded (like float()), so a column of well-formed
+    numbers needs no trimming, regex matching or splitting.
+    
+    Returns:
+        numpy array (missing values -> 0), or None when some value needs the
+        general path (padding, blanks, "0x", floats in an int column, ...)
+    """
     try:
-        # Check if it looks like hex
-        if str_val.lower().startswith("0x"):
-            return int(str_val, 16)
-        # Handle regular numbers that might be strings
-        return int(float(str_val))
-    except (ValueError, TypeError):
-        return 0
+        values = pc.fill_null(pc.cast(text, arrow_type), 0).to_numpy(zero_copy_only=False)
+    except pa.ArrowInvalid:
+        return None
+    if arrow_type == pa.float64() and not np.isfinite(values).all():
+        return None  # "nan"/"inf" are not numbers to the scalar helper
+    return values
 
 
-def wei_to_eth(wei_val):
-    """Convert Wei to ETH."""
-    if pd.isna(wei_val):
-        return 0.0
-    return float(wei_val) / 1e18
+def _split_numeric_text(text):
+    """
+    Trim a text column and split it for the vectorized converters.
+    
+    Returns:
+        (text, hex_rows, hex_text, decimal_rows, decimals): the trimmed text,
+        numpy masks of the 0x-hex and decimal rows, the trimmed hex strings
+        and the decimals parsed to float64 (correctly rounded, like float()).
+        Other rows convert to 0.
+    """
+    text = pc.utf8_trim_whitespace(text)
+    hex_rows = pc.fill_null(pc.match_substring_regex(text, HEX_PATTERN), False)
+    decimal_rows = pc.fill_null(pc.match_substring_regex(text, DECIMAL_PATTERN), False)
+    decimals = pc.cast(text.filter(decimal_rows), pa.float64()).to_numpy()
+    
+    return (
+        text, hex_rows.to_numpy(zero_copy_only=False), text.filter(hex_rows),
+        decimal_rows.to_numpy(zero_copy_only=False), decimals
+    )
 
 
-def wei_to_gwei(wei_val):
-    """Convert Wei to Gwei."""
-    if pd.isna(wei_val):
-        return 0.0
-    return float(wei_val) / 1e9
+def hex_series_to_int(series):
+    """
+    Vectorized _scalar_hex_to_int for a whole column, as int64.
+    
+    Numeric columns (typed Parquet input) are truncated to int64 directly.
+    Text columns of clean integers (decimal or 0x-hex) convert exactly with
+    one Arrow cast. Otherwise text is trimmed and split into 0x-hex rows,
+    decoded in bulk (up to 64 bits), plain integers, cast exactly, and other
+    decimal rows, parsed by Arrow and truncated like int(float(x)). Missing,
+    empty, "0x" and unparseable values give 0.
+    
+    Raises:
+        ValueError: If a value is outside the int64 range (the scalar helper
+            would return a Python int that no int64 column can hold)
+    """
+    if pd.api.types.is_float_dtype(series.dtype):
+        return pd.Series(np.trunc(series.fillna(0).to_numpy(dtype=np.float64)).astype(np.int64), index=series.index)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return pd.Series(series.fillna(0).to_numpy(dtype=np.int64), index=series.index)
+    
+    text = _numeric_text(series)
+    values = _cast_clean_text(text, pa.int64())
+    if values is not None:
+        # Arrow wraps 16-digit hex above 2**63 - 1 around to negative numbers
+        negative = np.flatnonzero(values < 0)
+        if len(negative) and not pc.all(pc.starts_with(text.take(negative), "-")).as_py():
+            raise ValueError(f"{series.name}: values outside the int64 range")
+        return pd.Series(values, index=series.index)
+    
+    trimmed, hex_rows, hex_text, decimal_rows, decimals = _split_numeric_text(text)
+    if ((decimals >= 2**63) | (decimals < -2**63)).any():
+        raise ValueError(f"{series.name}: values outside the int64 range")
+    values = np.zeros(len(series), dtype=np.int64)
+    values[hex_rows] = hex_series_to_int64(hex_text)  # raises above the int64 maximum
+    values[decimal_rows] = np.trunc(decimals)
+    
+    # Plain integers are cast exactly instead of through float64
+    integer_mask = pc.fill_null(pc.match_substring_regex(trimmed, INTEGER_PATTERN), False)
+    integer_rows = integer_mask.to_numpy(zero_copy_only=False)
+    if integer_rows.any():
+        integers = pc.utf8_ltrim(trimmed.filter(integer_mask), "+")  # Arrow's cast rejects "+5"
+        values[integer_rows] = pc.cast(integers, pa.int64()).to_numpy()
+    return pd.Series(values, index=series.index)
 
 
-def convert_timestamp(ts):
-    """Convert Unix timestamp to datetime object."""
-    try:
-        ts_int = int(ts)
-        return pd.to_datetime(ts_int, unit='s')
-    except (ValueError, TypeError):
-        return pd.NaT
+def hex_series_to_float(series):
+    """
+    Vectorized float(_scalar_hex_to_int(x)) for a whole column, as float64.
+    
+    Meant for wei amounts, which overflow int64: hex values up to 256 bits
+    are rounded exactly (hex_words_to_float64), decimal text is parsed by
+    Arrow and truncated to a whole number (one cast when the whole column
+    is clean decimal text).
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return pd.Series(np.trunc(series.fillna(0).to_numpy(dtype=np.float64)), index=series.index)
+    
+    text = _numeric_text(series)
+    values = _cast_clean_text(text, pa.float64())
+    if values is not None:
+        return pd.Series(np.trunc(values), index=series.index)
+    
+    _, hex_rows, hex_text, decimal_rows, decimals = _split_numeric_text(text)
+    values = np.zeros(len(series), dtype=np.float64)
+    if hex_rows.any():
+        digits = pc.utf8_slice_codeunits(hex_text, 2)
+        if pc.max(pc.utf8_length(digits)).as_py() > 64:
+            raise ValueError(f"{series.name}: hex values wider than 256 bits")
+        values[hex_rows] = hex_words_to_float64(pc.utf8_lpad(digits, 64, "0"), 1)[:, 0]
+    values[decimal_rows] = np.trunc(decimals)
+    return pd.Series(values, index=series.index)
+
+
+def convert_unique(series, convert):
+    """
+    Apply a vectorized converter to the distinct values of a column only.
+    
+    The column is factorized and `convert` runs on its uniques, whose results
+    are gathered back per row. Worth it for low-cardinality text such as the
+    status flags (2-3 distinct values); for near-unique columns factorizing
+    costs about as much as the conversion it saves.
+    
+    Args:
+        series: Column to convert (missing values are converted like any other)
+        convert: Function mapping a Series to a Series of the same length
+        
+    Returns:
+        Converted Series with the input's index
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    converted = convert(pd.Series(uniques)).to_numpy()
+    return pd.Series(converted[codes], index=series.index)
 
 
-def transform_transactions(df):
-    """Apply transformations to transaction DataFrame."""
+def transform_transactions(df, verbose=False):
+    """
+    Apply transformations to transaction DataFrame.
+    
+    Args:
+        df: Raw transactions DataFrame
+        verbose: If True, print a marker as each conversion stage starts
+        
+    Returns:
+        Transformed DataFrame (OUTPUT_COLUMNS present in the input)
+    """
+    stage = print if verbose else (lambda message: None)
     print(f"📊 Transforming {len(df):,} transactions...")
     
     # 0. Deduplicate (Remove extraction artifacts)
     # ---------------------------------------------------------
-    initial_count = len(df)
-    df = df.drop_duplicates(subset=['hash']).copy()
-    if len(df) < initial_count:
-        print(f"   • Removed {initial_count - len(df):,} duplicate transaction hashes")
+    # One boolean take is the only copy (none without duplicates); the shallow
+    # copy keeps the columns added below off the caller's frame
+    duplicated = df['hash'].duplicated(keep='first')
+    duplicate_count = int(duplicated.sum())
+    df = (df.loc[~duplicated] if duplicate_count else df).copy(deep=False)
+    if duplicate_count:
+        print(f"   • Removed {duplicate_count:,} duplicate transaction hashes")
     
     # 1. The "Big Three" Conversions
     # ---------------------------------------------------------
     
     # timestamp -> datetime
-    print("   • Converting timestamps...")
-    df['datetime'] = df['timeStamp'].apply(convert_timestamp)
+    stage("   • Converting timestamps...")
+    # Epoch seconds -> datetime64 in one vectorized call; unparseable values become NaT
+    seconds = pd.to_numeric(df['timeStamp'], errors='coerce')
+    df['datetime'] = pd.to_datetime(seconds, unit='s', errors='coerce')
     
     # value (Wei -> ETH)
-    print("   • Converting value (Wei -> ETH)...")
-    df['value_hex'] = df['value'] # Keep original just in case
+    stage("   • Converting value (Wei -> ETH)...")
     # Handle cases where value might be hex or scientific notation string
-    df['value_wei'] = df['value'].apply(hex_to_int)
-    df['value_eth'] = df['value_wei'].apply(wei_to_eth)
+    df['value_wei'] = hex_series_to_float(df['value'])
+    df['value_eth'] = df['value_wei'] / WEI_PER_ETH
     
     # gasPrice (Wei -> Gwei)
-    print("   • Converting gasPrice (Wei -> Gwei)...")
-    df['gas_price_wei'] = df['gasPrice'].apply(hex_to_int)
-    df['gas_price_gwei'] = df['gas_price_wei'].apply(wei_to_gwei)
+    stage("   • Converting gasPrice (Wei -> Gwei)...")
+    df['gas_price_wei'] = hex_series_to_int(df['gasPrice'])
+    df['gas_price_gwei'] = df['gas_price_wei'].astype('float64') / WEI_PER_GWEI
 
 
     # 2. Hex Numbers to Integers
     # ---------------------------------------------------------
-    print("   • Converting hex/strings to integers...")
+    stage("   • Converting hex/strings to integers...")
     
     # blockNumber
-    df['block_number'] = df['blockNumber'].apply(hex_to_int)
+    df['block_number'] = hex_series_to_int(df['blockNumber'])
     
     # nonce
-    df['nonce_int'] = df['nonce'].apply(hex_to_int)
+    df['nonce_int'] = hex_series_to_int(df['nonce'])
     
     # gasUsed
-    df['gas_used_int'] = df['gasUsed'].apply(hex_to_int)
+    df['gas_used_int'] = hex_series_to_int(df['gasUsed'])
 
     # 3. Status Flags (Optional but good practice)
     # ---------------------------------------------------------
+    # Any non-zero flag is True (blank/unparseable -> 0 -> False)
+    # (flags hold a handful of distinct values: parse each once)
     if 'isError' in df.columns:
-        df['is_error'] = df['isError'].apply(lambda x: bool(hex_to_int(x)))
+        df['is_error'] = convert_unique(df['isError'], hex_series_to_int).ne(0)
     
     if 'txreceipt_status' in df.columns:
-        df['tx_status'] = df['txreceipt_status'].apply(lambda x: bool(hex_to_int(x)))
+        df['tx_status'] = convert_unique(df['txreceipt_status'], hex_series_to_int).ne(0)
+
+    # Select and Reorder columns for clean output (only those that exist)
+    df = df.reindex(columns=[c for c in OUTPUT_COLUMNS if c in df.columns])
+    
+    # 4. Repetitive text as categoricals (int codes + one copy of each string)
+    # ---------------------------------------------------------
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    
+    return df
+
 
-    # Select and Reorder columns for clean output
-    cols_to_keep = [
-        'datetime', 'block_number', 'hash', 'from', 'to', 
-        'value_eth', 'gas_price_gwei', 'gas_used_int', 'nonce_int',
-        'is_error', 'tx_status', 'methodId', 'functionName'
-    ]
+def first_occurrence_mask(hashes):
+    """
+    Mark the first occurrence of each value in a column (like ~duplicated()).
     
-    # Only keep columns that actually exist
-    final_cols = [c for c in cols_to_keep if c in df.columns]
+    The column is dictionary-encoded in Arrow (one code per distinct value,
+    shared across chunks; missing values get a code of their own), and the
+    first position of every code is found with one numpy sort, so no Python
+    string is created per row.
     
-    return df[final_cols]
+    Args:
+        hashes: pyarrow Array or ChunkedArray
+        
+    Returns:
+        numpy bool array, True at the first row of each distinct value
+    """
+    encoded = pc.dictionary_encode(hashes, null_encoding="encode")
+    if isinstance(encoded, pa.ChunkedArray):
+        codes = np.concatenate([chunk.indices.to_numpy() for chunk in encoded.chunks] or [np.empty(0, np.int32)])
+    else:
+        codes = encoded.indices.to_numpy()
+    _, first = np.unique(codes, return_index=True)
+    keep = np.zeros(len(codes), dtype=bool)
+    keep[first] = True
+    return keep
 
 
-def save_processed(df, output_filename):
-    """Save processed data to CSV."""
-    output_path = Path(PROJECT_ROOT) / PROCESSED_DATA_DIR / output_filename
+def transform_transactions_file(input_path, output_path, batch_rows=TRANSFORM_BATCH_ROWS, debug_csv=False, verbose=False, max_workers=None):
+    """
+    Transform the raw transactions Parquet into a Snappy-compressed Parquet file.
+    
+    The input is read, transformed and written one record batch at a time
+    (only RAW_COLUMNS are loaded). Duplicates are found once up front from
+    the hash column alone (see first_occurrence_mask) and dropped from each
+    batch before transforming, which keeps the first occurrence of each hash
+    exactly as a single-pass transform_transactions would. Peak memory is the
+    hash column while the mask is built, then the batches in flight plus one
+    byte per input row for the mask.
+    
+    Once deduplicated, batches transform independently: inputs of more than
+    one batch are transformed on a process pool (one core each), with at most
+    one batch in flight per worker, and written back in input order.
+    
+    Args:
+        input_path: Path to the raw transactions Parquet file
+        output_path: Path of the Parquet file to write
+        batch_rows: Raw rows transformed per batch
+        debug_csv: If True, also dump a CSV copy next to the Parquet file
+        verbose: If True, print each batch's conversion stages
+        max_workers: Worker processes (default: one per CPU)
+        
+    Returns:
+        Tuple of (rows written, first transformed row or None)
+    """
+    parquet_file = pq.ParquetFile(input_path)
+    available = set(parquet_file.schema_arrow.names)
+    columns = [c for c in RAW_COLUMNS if c in available]
+    
+    output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    csv_path = output_path.with_suffix(".csv")
+    
+    keep = first_occurrence_mask(parquet_file.read(columns=['hash']).column('hash'))
+    
+    def raw_batches():
+        start = 0
+        for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=columns):
+            batch_keep = keep[start:start + batch.num_rows]
+            start += batch.num_rows
+            if batch_keep.any():
+                yield batch.filter(pa.array(batch_keep)).to_pandas()
     
-    df.to_csv(output_path, index=False)
-    print(f"💾 Saved {len(df):,} rows to {output_path}")
+    batches = -(-parquet_file.metadata.num_rows // batch_rows)
+    workers = min(max_workers or os.cpu_count() or 1, batches)
+    
+    writer = None
+    rows = 0
+    first_row = None
+    pool = None
+    try:
+        if workers <= 1:
+            processed = (transform_transactions(df_raw, verbose=verbose) for df_raw in raw_batches())
+        else:
+            print(f"   Using {workers} worker processes for {batches} batches")
+            pool = ProcessPoolExecutor(max_workers=workers)
+            processed = _transform_in_pool(pool, workers, raw_batches(), verbose)
+        
+        for df_processed in processed:
+            # Pinned schema: a batch with an all-null column must not change its type
+            table = pa.Table.from_pandas(
+                df_processed,
+                schema=pa.schema([(col, OUTPUT_TYPES[col]) for col in df_processed.columns]),
+                preserve_index=False
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema, compression="snappy")
+                first_row = df_processed.iloc[0]
+            writer.write_table(table)
+            
+            if debug_csv:
+                df_processed.to_csv(csv_path, mode="a" if rows else "w", header=not rows, index=False)
+            rows += len(df_processed)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if writer is not None:
+            writer.close()
+    
+    if writer is not None:
+        print(f"💾 Saved {rows:,} rows to {output_path}")
+        if debug_csv:
+            print(f"💾 Debug CSV dump: {csv_path}")
+    return rows, first_row
+
+
+def _transform_in_pool(pool, workers, raw_batches, verbose):
+    """Yield transformed batches in input order, keeping `workers` batches in flight."""
+    pending = deque()
+    for df_raw in raw_batches:
+        pending.append(pool.submit(transform_transactions, df_raw, verbose))
+        if len(pending) >= workers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# =============================================================================
+# SCALAR REFERENCE HELPERS (unit tests only)
+# =============================================================================
+# Row-at-a-time definitions of the conversions above. Production code goes
+# through the vectorized helpers only; tests check those against these.
+
+def _scalar_hex_to_int(hex_str):
+    """Convert hex string (or numeric string) to integer."""
+    if pd.isna(hex_str):
+        return 0
+    
+    str_val = str(hex_str).strip()
+    if str_val == "0x" or str_val == "":
+        return 0
+        
+    try:
+        # Check if it looks like hex
+        if str_val.lower().startswith("0x"):
+            return int(str_val, 16)
+        # Handle regular numbers that might be strings: integers exactly
+        # (float() would round wei-sized values), anything else via float
+        try:
+            return int(str_val)
+        except ValueError:
+            return int(float(str_val))
+    except (ValueError, TypeError):
+        return 0
+
+
+def _scalar_wei_to_eth(wei_val):
+    """Convert Wei to ETH."""
+    if pd.isna(wei_val):
+        return 0.0
+    return float(wei_val) / WEI_PER_ETH
+
+
+def _scalar_wei_to_gwei(wei_val):
+    """Convert Wei to Gwei."""
+    if pd.isna(wei_val):
+        return 0.0
+    return float(wei_val) / WEI_PER_GWEI
+
+
+def _scalar_convert_timestamp(ts):
+    """Convert Unix timestamp to datetime object."""
+    try:
+        ts_int = int(ts)
+        return pd.to_datetime(ts_int, unit='s')
+    except (ValueError, TypeError):
+        return pd.NaT
 
 
 # =============================================================================
@@ -152,19 +499,23 @@ if __name__ == "__main__":
         print("   Make sure to run the extraction script first.")
         exit(1)
         
-    print(f"📥 Reading {input_path}...")
+    print(f"📥 Transforming {input_path} in batches of {TRANSFORM_BATCH_ROWS:,} rows...")
     try:
-        # load specific columns as string to avoid pandas inference errors on large ints
-        df_raw = pd.read_csv(input_path, dtype=str)
-        print(f"   Found {len(df_raw):,} raw transactions")
+        # raw parquet is typed at extraction (int64 numerics, wei values kept as strings)
+        # --csv: also write a human-readable CSV copy for debugging
+        # --verbose: print the conversion stages of every batch
+        output_path = Path(PROJECT_ROOT) / PROCESSED_DATA_DIR / "transformed_transactions.parquet"
+        rows, sample = transform_transactions_file(
+            input_path, output_path,
+            debug_csv="--csv" in sys.argv, verbose="--verbose" in sys.argv
+        )
         
-        if len(df_raw) > 0:
-            df_processed = transform_transactions(df_raw)
-            save_processed(df_processed, "transformed_transactions.csv")
-            
+        if sample is not None:
             # Show sample
             print(f"\n📄 Sample processed row:")
-            print(df_processed.iloc[0])
+            print(sample)
+        else:
+            print("   No raw transactions found")
             
     except Exception as e:
         print(f"❌ Error processing file: {e}")
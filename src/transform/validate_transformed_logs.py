@@ -6,6 +6,8 @@ Reconciliation checks between raw and processed logs.
 
 import sys
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from pathlib import Path
 
 # Add project root to path
@@ -15,6 +17,10 @@ sys.path.insert(0, str(PROJECT_ROOT / "src"))
 from utils.config import BRIDGE_LOGS_FILE, PROCESSED_DATA_DIR
 
 
+# Raw columns validate_logs needs (row count only)
+RAW_COLUMNS = ["logIndex"]
+
+
 # =============================================================================
 # VALIDATION CHECKS
 # =============================================================================
@@ -43,8 +49,8 @@ def validate_logs(df_raw, df_parsed):
     
     # 3. Critical fields not null
     critical_cols = ["tx_hash", "block_number", "from_address", "value_eth"]
-    for col in critical_cols:
-        nulls = df_parsed[col].isnull().sum()
+    null_counts = df_parsed[critical_cols].isnull().sum()  # one pass, all columns
+    for col, nulls in null_counts.items():
         if nulls == 0:
             print(f"✅ No nulls in {col}")
         else:
@@ -60,9 +66,12 @@ def validate_logs(df_raw, df_parsed):
         print(f"❌ Found {negative_values} negative ETH values")
     
     # 5. Block numbers in expected range
-    min_block = df_parsed["block_number"].min()
-    max_block = df_parsed["block_number"].max()
-    if min_block >= 17000000 and max_block <= 30000000:
+    # Both bounds in one pass (pandas min() and max() each scan the column)
+    bounds = pc.min_max(pa.array(df_parsed["block_number"], from_pandas=True))
+    min_block, max_block = bounds["min"].as_py(), bounds["max"].as_py()
+    if min_block is None:
+        print(f"⚠️ Block range: no block numbers (verify if expected)")
+    elif min_block >= 17000000 and max_block <= 30000000:
         print(f"✅ Block range looks valid: {min_block:,} → {max_block:,}")
     else:
         print(f"⚠️ Block range: {min_block:,} → {max_block:,} (verify if expected)")
@@ -93,7 +102,8 @@ if __name__ == "__main__":
         exit(1)
     
     print(f"📥 Reading raw logs...")
-    df_raw = pd.read_csv(raw_path)
+    # Only the raw row count is compared: load one narrow column, not the payloads
+    df_raw = pd.read_parquet(raw_path, columns=RAW_COLUMNS)
     print(f"   Found {len(df_raw):,} raw rows")
     
     # Load processed logs
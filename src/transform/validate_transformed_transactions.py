@@ -6,6 +6,8 @@ Reconciliation checks between raw and processed transactions.
 
 import sys
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from pathlib import Path
 
 # Add project root to path
@@ -15,6 +17,10 @@ sys.path.insert(0, str(PROJECT_ROOT / "src"))
 from utils.config import LINEA_TXS_FILE, PROCESSED_DATA_DIR
 
 
+# Raw columns validate_transactions needs (row count and hash duplicates)
+RAW_COLUMNS = ["hash"]
+
+
 # =============================================================================
 # VALIDATION CHECKS
 # =============================================================================
@@ -49,42 +55,41 @@ def validate_transactions(df_raw, df_parsed):
     
     # 3. Critical fields not null
     critical_cols = ["hash", "block_number", "from", "value_eth"]
+    present_cols = [col for col in critical_cols if col in df_parsed.columns]
+    null_counts = df_parsed[present_cols].isnull().sum()  # one pass, all columns
     for col in critical_cols:
-        if col not in df_parsed.columns:
+        if col not in null_counts:
             errors.append(f"Missing column: {col}")
             print(f"❌ Missing column: {col}")
             continue
             
-        nulls = df_parsed[col].isnull().sum()
+        nulls = null_counts[col]
         if nulls == 0:
             print(f"✅ No nulls in {col}")
         else:
             errors.append(f"{col} has {nulls} nulls")
             print(f"❌ {col} has {nulls} nulls")
     
-    # 4. Value sanity checks
-    if "value_eth" in df_parsed.columns:
-        negative_values = (df_parsed["value_eth"] < 0).sum()
-        if negative_values == 0:
-            print(f"✅ No negative ETH values")
-        else:
-            errors.append(f"Found {negative_values} negative values")
-            print(f"❌ Found {negative_values} negative ETH values")
-            
-    if "gas_price_gwei" in df_parsed.columns:
-        negative_gas = (df_parsed["gas_price_gwei"] < 0).sum()
-        if negative_gas == 0:
-            print(f"✅ No negative gas prices")
+    # 4. Value sanity checks (one comparison over all amount columns)
+    amount_labels = {"value_eth": "ETH values", "gas_price_gwei": "gas prices"}
+    amount_cols = [col for col in amount_labels if col in df_parsed.columns]
+    negative_counts = (df_parsed[amount_cols] < 0).sum()
+    for col, negatives in negative_counts.items():
+        if negatives == 0:
+            print(f"✅ No negative {amount_labels[col]}")
         else:
-            errors.append(f"Found {negative_gas} negative gas prices")
-            print(f"❌ Found {negative_gas} negative gas prices")
+            errors.append(f"Found {negatives} negative {amount_labels[col]}")
+            print(f"❌ Found {negatives} negative {amount_labels[col]}")
     
     # 5. Block numbers in expected range (Linea Mainnet started around block 0, but mainly active later)
     # We'll just check for non-negative and reasonable max (e.g. < 100M for now)
     if "block_number" in df_parsed.columns:
-        min_block = df_parsed["block_number"].min()
-        max_block = df_parsed["block_number"].max()
-        if min_block >= 0 and max_block <= 100000000:
+        # Both bounds in one pass (pandas min() and max() each scan the column)
+        bounds = pc.min_max(pa.array(df_parsed["block_number"], from_pandas=True))
+        min_block, max_block = bounds["min"].as_py(), bounds["max"].as_py()
+        if min_block is None:
+            print(f"⚠️ Block range: no block numbers (verify if expected)")
+        elif min_block >= 0 and max_block <= 100000000:
             print(f"✅ Block range looks valid: {min_block:,} → {max_block:,}")
         else:
             print(f"⚠️ Block range: {min_block:} → {max_block:} (verify if expected)")
@@ -115,18 +120,24 @@ if __name__ == "__main__":
         exit(1)
     
     print(f"📥 Reading raw transactions...")
-    # Load raw with dtype=str to avoid inference issues, consistent with transformer
-    df_raw = pd.read_csv(raw_path, dtype=str)
+    # Only the row count and hash duplicates are checked: skip every other column
+    df_raw = pd.read_parquet(raw_path, columns=RAW_COLUMNS)
     print(f"   Found {len(df_raw):,} raw rows")
     
     # Load processed transactions
-    parsed_path = Path(PROJECT_ROOT) / f"{PROCESSED_DATA_DIR}/transformed_transactions.csv"
+    # Parquet (typed) is the transformer's output; CSV from older runs still works
+    parsed_path = Path(PROJECT_ROOT) / f"{PROCESSED_DATA_DIR}/transformed_transactions.parquet"
+    if not parsed_path.exists():
+        parsed_path = parsed_path.with_suffix(".csv")
     if not parsed_path.exists():
-        print(f"❌ Processed file not found: {parsed_path}")
+        print(f"❌ Processed file not found: {parsed_path.with_suffix('.parquet')}")
         exit(1)
     
     print(f"📥 Reading processed transactions...")
-    df_parsed = pd.read_csv(parsed_path)
+    if parsed_path.suffix == ".parquet":
+        df_parsed = pd.read_parquet(parsed_path)
+    else:
+        df_parsed = pd.read_csv(parsed_path)
     print(f"   Found {len(df_parsed):,} processed rows\n")
     
     # Run validation
@@ -2,19 +2,58 @@
 Block Utilities
 ===============
 Convert dates to block numbers using Etherscan/Lineascan API.
+
+Lookups for dates in the past never change, so they are memoized in-process
+and persisted to a small JSON file that reruns read instead of the API.
 """
 
+import json
+import os
+import orjson
 import requests
 from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
 from .config import ETHEREUM_CHAIN_ID, LINEA_CHAIN_ID
 
 
-def get_block_by_date(date_str: str, chain_id: int, api_key: str, closest: str = "before") -> int:
+# Disk cache of resolved blocks, keyed "{chain_id}:{date}:{closest}"
+BLOCK_CACHE_PATH = Path.home() / ".cache" / "linea_user_analytics" / "blocks.json"
+
+
+def _load_block_cache() -> dict:
+    """Read the disk cache (empty if missing or unreadable)."""
+    try:
+        with open(BLOCK_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_block_cache_entry(key: str, block: int) -> None:
     """
-    Get block number for a specific date.
+    Add one entry to the disk cache.
+    
+    Written to a temp file and swapped in with os.replace, so concurrent runs
+    never see a half-written file (at worst one run's new entry is lost and
+    looked up again next time).
+    """
+    cache = _load_block_cache()
+    cache[key] = block
+    
+    BLOCK_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = BLOCK_CACHE_PATH.with_name(f"{BLOCK_CACHE_PATH.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, BLOCK_CACHE_PATH)
+
+
+def fetch_block_by_date(timestamp: int, chain_id: int, api_key: str, closest: str = "before") -> int:
+    """
+    Query the API for the block closest to a Unix timestamp (uncached).
     
     Args:
-        date_str: Date in format "YYYY-MM-DD"
+        timestamp: Unix timestamp in seconds
         chain_id: 1 for Ethereum, 59144 for Linea
         api_key: Etherscan/Lineascan API key
         closest: "before" or "after" - which block to return
@@ -22,11 +61,6 @@ def get_block_by_date(date_str: str, chain_id: int, api_key: str, closest: str =
     Returns:
         Block number as integer
     """
-    # Convert date to Unix timestamp (midnight UTC)
-    dt = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-    timestamp = int(dt.timestamp())
-    print(timestamp)
-
     # Use Etherscan v2 API
     url = "https://api.etherscan.io/v2/api"
     params = {
@@ -39,7 +73,7 @@ def get_block_by_date(date_str: str, chain_id: int, api_key: str, closest: str =
     }
     
     response = requests.get(url, params=params, timeout=30)
-    data = response.json()
+    data = orjson.loads(response.content)
     
     if data.get("status") == "1":
         return int(data.get("result"))
@@ -47,6 +81,43 @@ def get_block_by_date(date_str: str, chain_id: int, api_key: str, closest: str =
         raise ValueError(f"API error: {data.get('message')} - {data.get('result')}")
 
 
+@lru_cache(maxsize=256)
+def get_block_by_date(date_str: str, chain_id: int, api_key: str, closest: str = "before") -> int:
+    """
+    Get block number for a specific date.
+    
+    Checks the in-process and disk caches first; only dates that have already
+    passed are written to disk (a future date's block can still change).
+    
+    Args:
+        date_str: Date in format "YYYY-MM-DD"
+        chain_id: 1 for Ethereum, 59144 for Linea
+        api_key: Etherscan/Lineascan API key
+        closest: "before" or "after" - which block to return
+    
+    Returns:
+        Block number as integer
+    """
+    cache_key = f"{chain_id}:{date_str}:{closest}"
+    cache = _load_block_cache()
+    if cache_key in cache:
+        return cache[cache_key]
+    
+    # Convert date to Unix timestamp (midnight UTC)
+    dt = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    timestamp = int(dt.timestamp())
+    print(timestamp)
+    
+    block = fetch_block_by_date(timestamp, chain_id, api_key, closest)
+    
+    if dt < datetime.now(timezone.utc):
+        try:
+            _save_block_cache_entry(cache_key, block)
+        except OSError as e:
+            print(f"⚠️ Could not write block cache: {e}")
+    return block
+
+
 def get_eth_block_by_date(date_str: str, api_key: str, closest: str = "before") -> int:
     """Get Ethereum mainnet block number for a date."""
     return get_block_by_date(date_str, chain_id=ETHEREUM_CHAIN_ID, api_key=api_key, closest=closest)
@@ -73,16 +73,19 @@ RAW_DATA_DIR = "data/raw"
 PROCESSED_DATA_DIR = "data/transformed"
 
 # Output file names
-BRIDGE_LOGS_FILE = f"{RAW_DATA_DIR}/etherscan_logs.csv"
-LINEA_TXS_FILE = f"{RAW_DATA_DIR}/linea_transactions.csv"
+BRIDGE_LOGS_FILE = f"{RAW_DATA_DIR}/etherscan_logs.parquet"
+LINEA_TXS_FILE = f"{RAW_DATA_DIR}/linea_transactions.parquet"
+
+# Raw API responses, reused by reruns (set REFRESH_RESPONSE_CACHE=1 to re-fetch)
+RESPONSE_CACHE_FILE = ".cache/lineascan_responses.sqlite"
+REFRESH_RESPONSE_CACHE = os.getenv("REFRESH_RESPONSE_CACHE", "0") == "1"
 
 # =============================================================================
 # API SETTINGS
 # =============================================================================
 
-# Etherscan rate limits
+# Etherscan rate limits (enforced across all worker threads by the shared session)
 REQUESTS_PER_SECOND = 4 # max 5 in API
-REQUEST_DELAY = 0.15  # seconds between requests
 
 # =============================================================================
 # DATABASE SETTINGS
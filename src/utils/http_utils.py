@@ -0,0 +1,151 @@
+"""
+HTTP Utilities
+==============
+Shared requests session setup for the block explorer APIs.
+"""
+
+import random
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+# Upper bound (seconds) of the random jitter added to each backoff
+BACKOFF_JITTER = 1.0
+
+# Enable TCP keepalive on pooled sockets so idle connections between pages
+# are not silently dropped by NAT/load balancers (forcing a new handshake)
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+]
+
+
+class JitterRetry(Retry):
+    """
+    Retry with random jitter on top of urllib3's capped exponential backoff.
+    
+    Worker threads throttled by the same rate-limit burst would otherwise
+    sleep identical intervals and retry in lockstep. A Retry-After header,
+    when present, still takes precedence.
+    
+    Retries happen inside the adapter, below RateLimitedSession.request, so
+    with a rate_limiter every retry also takes a slot after its backoff:
+    retries count against the shared limit instead of bursting past it
+    exactly when the API is throttling.
+    """
+
+    def __init__(self, *args, rate_limiter=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+
+    def new(self, **kwargs):
+        # urllib3 replaces the Retry object on every attempt; keep the limiter
+        retry = super().new(**kwargs)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait()
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return backoff
+        return backoff + random.uniform(0, BACKOFF_JITTER)
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections use KEEPALIVE_SOCKET_OPTIONS."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = KEEPALIVE_SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
+class RateLimiter:
+    """Space out calls from any number of threads to at most `rate` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        """Block until this caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class RateLimitedSession(requests.Session):
+    """Session that takes a RateLimiter slot before every request."""
+
+    def __init__(self, rate_limiter: RateLimiter):
+        super().__init__()
+        self.rate_limiter = rate_limiter
+
+    def request(self, *args, **kwargs):
+        self.rate_limiter.wait()
+        return super().request(*args, **kwargs)
+
+
+def create_session(
+    pool_size: int = 16,
+    total_retries: int = 5,
+    backoff_factor: float = 0.5,
+    max_requests_per_second: float = None
+) -> requests.Session:
+    """
+    Create a session with a sized keep-alive pool and automatic retries.
+
+    One session is shared by all worker threads; with pool_maxsize above the
+    thread count no thread ever opens a throwaway connection. With
+    max_requests_per_second set, the API rate limit is enforced across all
+    threads at once, so the thread count only sets how many requests can be
+    in flight, not how fast they are sent.
+
+    Retries (connection errors and RETRY_STATUS_CODES) are handled by urllib3
+    with jittered exponential backoff, honouring Retry-After on 429s, and reuse the
+    pooled connection instead of opening a new TLS session per attempt. Each
+    retry takes a rate-limit slot too.
+
+    Args:
+        pool_size: Connections kept per host (match the number of worker threads)
+        total_retries: Maximum retries per request
+        backoff_factor: Base of the exponential backoff in seconds
+        max_requests_per_second: Shared request rate cap (None = unlimited)
+
+    Returns:
+        Configured requests.Session
+    """
+    rate_limiter = RateLimiter(max_requests_per_second) if max_requests_per_second else None
+    retry = JitterRetry(
+        total=total_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=["GET"],
+        respect_retry_after_header=True,
+        rate_limiter=rate_limiter
+    )
+    adapter = KeepAliveAdapter(pool_connections=pool_size, pool_maxsize=pool_size * 2, max_retries=retry)
+
+    if rate_limiter is not None:
+        session = RateLimitedSession(rate_limiter)
+    else:
+        session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
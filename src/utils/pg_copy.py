@@ -0,0 +1,399 @@
+"""
+Postgres Binary COPY
+====================
+Encode DataFrames into PostgreSQL's binary COPY format.
+
+Binary COPY skips the int -> text -> int round trip that CSV COPY forces on
+both sides: pandas never stringifies the values and the server never runs
+its text input functions. Layout (see the COPY docs, "Binary Format"):
+
+- 11-byte signature, int32 flags, int32 header extension length
+- per row: int16 field count, then per field an int32 length (-1 = NULL)
+  followed by that many bytes in network (big-endian) order
+- int16 -1 trailer
+"""
+
+import math
+import os
+import struct
+import threading
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# =============================================================================
+# FORMAT CONSTANTS
+# =============================================================================
+
+PG_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+PG_COPY_HEADER = PG_COPY_SIGNATURE + struct.pack(">ii", 0, 0)
+PG_COPY_TRAILER = struct.pack(">h", -1)
+NULL_FIELD = struct.pack(">i", -1)
+
+# Postgres timestamps count microseconds from 2000-01-01 UTC
+PG_EPOCH = pd.Timestamp("2000-01-01", tz="UTC")
+
+# Flush encoded rows to the sink in chunks this size to amortize write() calls
+FLUSH_SIZE = 64 * 1024
+
+# Rows encoded per pass - bounds memory held by the per-column field lists
+ENCODE_CHUNK_ROWS = 65_536
+
+# Fixed-width types: pg type -> big-endian numpy dtype of the payload
+FIXED_WIDTH_TYPES = {
+    "int2": ">i2",
+    "int4": ">i4",
+    "int8": ">i8",
+    "float8": ">f8",
+    "bool": ">u1",
+    "timestamptz": ">i8",
+}
+
+# Numeric sign flags
+NUMERIC_POS = 0x0000
+NUMERIC_NEG = 0x4000
+NUMERIC_NAN = 0xC000
+
+# Base-10000 digit slots that hold any float's shortest repr (<= 17 significant
+# decimal digits, plus one slot for aligning the exponent to a group boundary)
+FLOAT_NUMERIC_GROUPS = 6
+
+# Layout of Arrow's float -> string cast: "-12.5", "0.00001", "1.5e-7", "1e+22"
+FLOAT_TEXT_PATTERN = r"^-?(?P<int>\d+)\.?(?P<frac>\d*)(?:e\+?(?P<exp>-?\d+))?$"
+
+
+# =============================================================================
+# FIELD ENCODERS
+# =============================================================================
+
+def _decimal_parts(value):
+    """
+    Split a number into (negative, integer coefficient, base-10 exponent).
+
+    Floats are split straight from their repr() - the shortest string that
+    round-trips the float - without building a Decimal. Returns None for NaN.
+    """
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        text = repr(value)
+        negative = text[0] == "-"
+        mantissa, _, exp = text.lstrip("-").partition("e")
+        int_part, _, frac_part = mantissa.partition(".")
+        return negative, int(int_part + frac_part), int(exp or 0) - len(frac_part)
+
+    value = Decimal(value)
+    if value.is_nan():
+        return None
+    sign, digits, exponent = value.as_tuple()
+    return bool(sign), int("".join(map(str, digits))), exponent
+
+
+def encode_numeric(value):
+    """
+    Encode a number as a binary NUMERIC payload (without the length prefix).
+
+    NUMERIC is stored as base-10000 digits: int16 ndigits, int16 weight
+    (power of 10000 of the first digit), uint16 sign, int16 display scale,
+    then ndigits int16 digits.
+    """
+    parts = _decimal_parts(value)
+    if parts is None:
+        return struct.pack(">hhHh", 0, 0, NUMERIC_NAN, 0)
+
+    negative, coefficient, exponent = parts
+    dscale = max(0, -exponent)
+    if coefficient == 0:
+        return struct.pack(">hhHh", 0, 0, NUMERIC_POS, dscale)
+
+    # Align the exponent to a base-10000 digit boundary, then split into groups
+    shift = exponent % 4
+    coefficient *= 10 ** shift
+    groups = []
+    while coefficient:
+        coefficient, group = divmod(coefficient, 10000)
+        groups.append(group)
+    groups.reverse()
+    weight = (exponent - shift) // 4 + len(groups) - 1
+
+    # Strip trailing zero groups (Postgres canonical form)
+    while groups[-1] == 0:
+        groups.pop()
+
+    return struct.pack(
+        f">hhHh{len(groups)}h",
+        len(groups), weight, NUMERIC_NEG if negative else NUMERIC_POS, dscale, *groups
+    )
+
+
+def _encode_fixed_width(series, pg_type, null_mask):
+    """Encode a fixed-width column in one numpy pass, then slice it per row."""
+    dtype = np.dtype(FIXED_WIDTH_TYPES[pg_type])
+
+    if pg_type == "timestamptz":
+        ts = pd.to_datetime(series, utc=True).fillna(PG_EPOCH)
+        values = ((ts - PG_EPOCH) // pd.Timedelta(microseconds=1)).to_numpy()
+    elif pg_type == "bool":
+        values = series.fillna(False).astype(bool).to_numpy()
+    else:
+        values = pd.to_numeric(series).fillna(0).to_numpy()
+        # numpy would wrap out-of-range integers silently; Postgres rejects them
+        if dtype.kind == "i" and len(values):
+            info = np.iinfo(dtype)
+            if values.min() < info.min or values.max() > info.max:
+                raise ValueError(f"{series.name}: values out of range for {pg_type}")
+
+    records = np.empty(len(series), dtype=[("length", ">i4"), ("value", dtype)])
+    records["length"] = dtype.itemsize
+    records["value"] = values
+
+    raw = records.tobytes()
+    width = records.dtype.itemsize
+    fields = [raw[i:i + width] for i in range(0, len(raw), width)]
+
+    for i in np.flatnonzero(null_mask):
+        fields[i] = NULL_FIELD
+    return fields
+
+
+def _encode_variable_width(series, pg_type, null_mask):
+    """Encode text/numeric columns value by value with a length prefix."""
+    if pg_type == "numeric":
+        return _encode_numeric_column(series)
+
+    fields = []
+    for value, is_null in zip(series.to_numpy(dtype=object), null_mask):
+        if is_null:
+            fields.append(NULL_FIELD)
+        else:
+            payload = str(value).encode("utf-8")
+            fields.append(struct.pack(">i", len(payload)) + payload)
+    return fields
+
+
+def _encode_float_numerics(values):
+    """
+    Encode finite float64 values as length-prefixed NUMERIC fields in bulk.
+
+    Arrow's float -> string cast yields the same shortest round-trip digits
+    as repr() (only the layout differs), so the digits are cut out of those
+    strings with Arrow kernels and split into base-10000 groups with numpy.
+    The output is byte-identical to encode_numeric() on each value.
+    """
+    text = pc.cast(pa.array(values, type=pa.float64()), pa.string())
+    negative = pc.starts_with(text, "-").to_numpy(zero_copy_only=False)
+    parts = pc.extract_regex(text, FLOAT_TEXT_PATTERN)
+
+    # Coefficient without leading/trailing zeros; exponent adjusted to match
+    digits = pc.binary_join_element_wise(parts.field("int"), parts.field("frac"), "")
+    significant = pc.utf8_rtrim(digits, "0")
+    trailing_zeros = pc.subtract(pc.utf8_length(digits), pc.utf8_length(significant))
+    significant = pc.utf8_ltrim(significant, "0")
+    exp_text = parts.field("exp")
+
+    coefficient = pc.cast(pc.if_else(pc.equal(significant, ""), "0", significant), pa.int64()).to_numpy()
+    exponent = (
+        pc.cast(pc.if_else(pc.equal(exp_text, ""), "0", exp_text), pa.int64()).to_numpy()
+        + pc.cast(trailing_zeros, pa.int64()).to_numpy()
+        - pc.cast(pc.utf8_length(parts.field("frac")), pa.int64()).to_numpy()
+    )
+    is_zero = coefficient == 0
+
+    # repr() prints decimal exponents -4..15 positionally, with at least one
+    # fractional digit ("100.0"), and everything else in scientific notation
+    magnitude = exponent + pc.utf8_length(significant).to_numpy() - 1
+    positional = (magnitude >= -4) & (magnitude < 16)
+    dscale = np.maximum(positional.astype(np.int64), -exponent)
+    dscale[is_zero] = 1
+
+    # Base-10000 groups, least significant first, aligned as in encode_numeric
+    shift = exponent % 4
+    low_width = np.power(10, 4 - shift)
+    groups = np.empty((len(values), FLOAT_NUMERIC_GROUPS), dtype=np.int64)
+    groups[:, 0] = coefficient % low_width * np.power(10, shift)
+    rest = coefficient // low_width
+    for slot in range(1, FLOAT_NUMERIC_GROUPS):
+        rest, groups[:, slot] = np.divmod(rest, 10000)
+
+    # Drop leading and trailing zero groups (Postgres canonical form)
+    nonzero = groups != 0
+    top = FLOAT_NUMERIC_GROUPS - 1 - np.argmax(nonzero[:, ::-1], axis=1)
+    bottom = np.argmax(nonzero, axis=1)
+    ndigits = np.where(is_zero, 0, top - bottom + 1)
+    weight = np.where(is_zero, 0, (exponent - shift) // 4 + top)
+    sign = np.where(negative & ~is_zero, NUMERIC_NEG, NUMERIC_POS)
+
+    # One fixed-width record layout per digit count
+    fields = [None] * len(values)
+    for count in np.unique(ndigits).tolist():
+        rows = np.flatnonzero(ndigits == count)
+        records = np.empty(len(rows), dtype=[
+            ("length", ">i4"), ("ndigits", ">i2"), ("weight", ">i2"),
+            ("sign", ">u2"), ("dscale", ">i2"), ("digits", ">i2", (count,)),
+        ])
+        records["length"] = 8 + 2 * count
+        records["ndigits"] = count
+        records["weight"] = weight[rows]
+        records["sign"] = sign[rows]
+        records["dscale"] = dscale[rows]
+        records["digits"] = np.take_along_axis(groups[rows], top[rows, None] - np.arange(count), axis=1)
+
+        raw = records.tobytes()
+        width = records.dtype.itemsize
+        for offset, row in zip(range(0, len(raw), width), rows.tolist()):
+            fields[row] = raw[offset:offset + width]
+    return fields
+
+
+def _encode_numeric_column(series):
+    """Encode each distinct numeric value once (amounts and fees repeat a lot)."""
+    codes, uniques = pd.factorize(series)
+
+    if pd.api.types.is_float_dtype(uniques.dtype):
+        values = np.asarray(uniques, dtype=np.float64)
+        finite = np.isfinite(values)
+        encoded = np.empty(len(values), dtype=object)
+        encoded[finite] = _encode_float_numerics(values[finite])
+        for i in np.flatnonzero(~finite):
+            payload = encode_numeric(float(values[i]))
+            encoded[i] = struct.pack(">i", len(payload)) + payload
+        encoded = encoded.tolist()
+    else:
+        encoded = []
+        for value in uniques:
+            payload = encode_numeric(value)
+            encoded.append(struct.pack(">i", len(payload)) + payload)
+    encoded.append(NULL_FIELD)  # code -1 = missing
+
+    return [encoded[code] for code in codes]
+
+
+def encode_column(series, pg_type):
+    """
+    Encode one column into a list of length-prefixed binary COPY fields.
+
+    Args:
+        series: Column values (NaN/None/NaT become NULL)
+        pg_type: One of int2, int4, int8, float8, bool, timestamptz, numeric, text
+
+    Returns:
+        List of bytes, one per row
+    """
+    null_mask = series.isna().to_numpy()
+    if pg_type in FIXED_WIDTH_TYPES:
+        return _encode_fixed_width(series, pg_type, null_mask)
+    return _encode_variable_width(series, pg_type, null_mask)
+
+
+# =============================================================================
+# WRITER
+# =============================================================================
+
+def write_dataframe_to_pg_binary(df, column_types, sink, chunk_rows=ENCODE_CHUNK_ROWS) -> int:
+    """
+    Write a DataFrame to `sink` in Postgres binary COPY format.
+
+    Rows are encoded `chunk_rows` at a time so a streaming sink (see
+    copy_from_producer) starts receiving bytes before the whole frame is encoded.
+
+    Args:
+        df: DataFrame holding (at least) the columns in column_types
+        column_types: Ordered dict of column name -> pg type, matching the
+            column list of the COPY statement
+        sink: Binary file-like object with a write() method
+        chunk_rows: Number of rows encoded per pass
+
+    Returns:
+        Number of rows written
+    """
+    return write_frames_to_pg_binary([df], column_types, sink, chunk_rows)
+
+
+def write_frames_to_pg_binary(frames, column_types, sink, chunk_rows=ENCODE_CHUNK_ROWS) -> int:
+    """
+    Write a sequence of DataFrames to `sink` as one binary COPY stream.
+
+    Frames are consumed lazily, so a generator (e.g. CSV blocks read from
+    disk) is encoded without ever holding more than one frame in memory.
+
+    Args:
+        frames: Iterable of DataFrames holding the columns in column_types
+        column_types: Ordered dict of column name -> pg type, matching the
+            column list of the COPY statement
+        sink: Binary file-like object with a write() method
+        chunk_rows: Number of rows encoded per pass
+
+    Returns:
+        Number of rows written
+    """
+    row_header = struct.pack(">h", len(column_types))
+
+    sink.write(PG_COPY_HEADER)
+
+    rows = 0
+    buffer = bytearray()
+    for df in frames:
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            columns = [encode_column(chunk[col], pg_type) for col, pg_type in column_types.items()]
+
+            for fields in zip(*columns):
+                buffer += row_header
+                buffer += b"".join(fields)
+                if len(buffer) >= FLUSH_SIZE:
+                    sink.write(buffer)
+                    buffer = bytearray()
+        rows += len(df)
+
+    buffer += PG_COPY_TRAILER
+    sink.write(buffer)
+    return rows
+
+
+def copy_from_producer(cur, copy_sql, produce):
+    """
+    Run `COPY ... FROM STDIN` fed through an OS pipe by a background thread.
+
+    `produce(sink)` writes the COPY payload into the pipe while libpq reads
+    the other end, so encoding overlaps with network/server work and only
+    a pipe's worth of bytes is buffered instead of the whole payload.
+
+    Args:
+        cur: psycopg2 cursor
+        copy_sql: COPY ... FROM STDIN statement
+        produce: Callable taking a binary sink; its return value is passed through
+
+    Returns:
+        Whatever `produce` returned (e.g. rows written)
+    """
+    read_fd, write_fd = os.pipe()
+    result = {}
+
+    def run():
+        try:
+            with os.fdopen(write_fd, "wb") as sink:
+                result["value"] = produce(sink)
+        except BaseException as e:
+            result["error"] = e
+
+    producer = threading.Thread(target=run, daemon=True)
+    producer.start()
+
+    try:
+        # Closing the read end on COPY failure unblocks the producer (BrokenPipeError)
+        with os.fdopen(read_fd, "rb") as source:
+            cur.copy_expert(copy_sql, source, size=FLUSH_SIZE)
+    except BaseException:
+        # The database error is the real cause; the producer's broken pipe is a symptom
+        producer.join()
+        raise
+    
+    producer.join()
+    if "error" in result:
+        raise result["error"]
+
+    return result.get("value")
@@ -0,0 +1,51 @@
+"""
+Response Cache
+==============
+On-disk cache of raw API response bodies, so reruns skip requests
+that were already answered.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+class ResponseCache:
+    """
+    Thread-safe SQLite store of response bodies keyed by request parameters.
+
+    Bodies are stored as the raw bytes returned by the API and parsed again on
+    read, so the cache never depends on how callers post-process results.
+    """
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One connection shared by all worker threads, serialized by a lock
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL;")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body BLOB NOT NULL);"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for `key`, or None if it was never stored."""
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM responses WHERE key = ?;", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, body: bytes) -> None:
+        """Store (or replace) the body for `key`."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses (key, body) VALUES (?, ?);", (key, body))
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,45 @@
+"""
+Unit Tests for block_utils.py
+=============================
+Tests the block lookup cache (API call replaced by a stub).
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from utils import block_utils
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def test_get_block_by_date_cache(tmp_path, monkeypatch):
+    """Test past dates hit the API once, then come from the disk cache."""
+    calls = []
+
+    def fake_fetch(timestamp, chain_id, api_key, closest="before"):
+        calls.append(timestamp)
+        return 123
+
+    monkeypatch.setattr(block_utils, "BLOCK_CACHE_PATH", tmp_path / "blocks.json")
+    monkeypatch.setattr(block_utils, "fetch_block_by_date", fake_fetch)
+    block_utils.get_block_by_date.cache_clear()
+
+    assert block_utils.get_block_by_date("2024-01-01", 1, "key") == 123
+    assert calls == [1704067200]
+    assert block_utils._load_block_cache() == {"1:2024-01-01:before": 123}
+
+    # A fresh process (empty in-memory cache) reads the disk cache
+    block_utils.get_block_by_date.cache_clear()
+    assert block_utils.get_block_by_date("2024-01-01", 1, "key") == 123
+    assert len(calls) == 1
+
+    # Future dates are not persisted
+    block_utils.get_block_by_date("2999-01-01", 1, "key")
+    assert "1:2999-01-01:before" not in block_utils._load_block_cache()
+    block_utils.get_block_by_date.cache_clear()
@@ -0,0 +1,42 @@
+"""
+Unit Tests for extract_transactions_from_lineascan.py
+=====================================================
+Tests the typed Parquet cast of txlist rows (no API calls, no file I/O).
+"""
+
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from extract.extract_transactions_from_lineascan import (
+    API_SCHEMA,
+    TRANSACTION_FIELDS,
+    TRANSACTION_SCHEMA,
+    cast_transaction_table
+)
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def test_cast_transaction_table_nulls_unparsable_integers():
+    """Test blank or non-numeric integer fields become null instead of failing the cast."""
+    rows = [dict.fromkeys(TRANSACTION_FIELDS, "12"), dict.fromkeys(TRANSACTION_FIELDS, "")]
+    rows[1]["gas"] = "0x10"
+    table = pa.Table.from_batches([
+        pa.RecordBatch.from_pylist(rows[:1], schema=API_SCHEMA),
+        pa.RecordBatch.from_pylist(rows[1:], schema=API_SCHEMA)
+    ])
+
+    result = cast_transaction_table(table)
+
+    assert result.schema == TRANSACTION_SCHEMA
+    assert result.column("blockNumber").to_pylist() == [12, None]
+    assert result.column("gas").to_pylist() == [12, 16]
+    assert result.column("hash").to_pylist() == ["12", ""]
@@ -0,0 +1,80 @@
+"""
+Unit Tests for hex_utils.py
+===========================
+Tests vectorized hex decoding (no API calls, no file I/O).
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from utils.hex_utils import hex_series_to_int64, hex_words_to_float64, limbs_to_float64
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def test_hex_series_to_int64():
+    """Test bulk hex decoding matches int(x, 16)."""
+    values = ["0x1f4", "0x0", "0x", None, "0x12A05F200", "0x7fffffffffffffff"]
+    result = hex_series_to_int64(pd.Series(values))
+    assert result.tolist() == [500, 0, 0, 0, 5_000_000_000, 2**63 - 1]
+
+
+def test_hex_series_to_int64_arrow_input():
+    """Test pyarrow arrays decode like Series, including sliced arrays."""
+    values = pa.array(["0xff", "0x1f4", None, "0x", "0xabc"])
+    assert hex_series_to_int64(values).tolist() == [255, 500, 0, 0, 2748]
+    assert hex_series_to_int64(values.slice(1, 3)).tolist() == [500, 0, 0]
+    assert hex_series_to_int64(pd.Series([], dtype=object)).tolist() == []
+
+
+def test_hex_series_to_int64_too_wide():
+    """Test values wider than 64 bits, or above the int64 maximum, are rejected instead of wrapped."""
+    for value in ["0x" + "f" * 17, "0x8000000000000000", "0x" + "f" * 16]:
+        with pytest.raises(ValueError):
+            hex_series_to_int64(pd.Series(["0x1", value]))
+
+
+def test_hex_words_to_float64():
+    """Test uint256 word decoding, including words wider than 64 bits."""
+    words = [100, 10**20, 42]  # 1e20 wei does not fit in uint64
+    payload = "".join(format(w, "064x") for w in words) + "0" * 128
+    result = hex_words_to_float64(pd.Series([payload, None]), 3)
+    assert result[0].tolist() == [100.0, 1e20, 42.0]
+    assert np.isnan(result[1]).all()
+    
+    # Sliced pyarrow input; payloads shorter than the requested words are rejected
+    sliced = pa.array([None, payload, payload]).slice(1)
+    assert hex_words_to_float64(sliced, 3).tolist() == [[100.0, 1e20, 42.0]] * 2
+    with pytest.raises(ValueError):
+        hex_words_to_float64(pd.Series([payload[:100]]), 3)
+    
+    # A shared "0x" prefix is skipped by the slice itself
+    prefixed = hex_words_to_float64(pd.Series(["0x" + payload, None]), 3, prefix="0x")
+    np.testing.assert_array_equal(prefixed, result)
+
+
+def test_limbs_to_float64_rounds_like_float():
+    """Test wide words round exactly as float(int) does, including ties."""
+    values = [
+        2**64,
+        2**256 - 1,
+        (2**53 + 1) << 100,        # exactly halfway, odd mantissa -> rounds up
+        ((2**53 + 1) << 100) + 1,  # just above halfway, sticky bit decides
+        (2**54 + 1) << 100,        # halfway, even mantissa -> rounds down
+    ]
+    limbs = np.array(
+        [[(v >> (64 * (3 - i))) & (2**64 - 1) for i in range(4)] for v in values],
+        dtype=np.uint64
+    )
+    assert limbs_to_float64(limbs).tolist() == [float(v) for v in values]
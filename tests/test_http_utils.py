@@ -0,0 +1,47 @@
+"""
+Unit Tests for http_utils.py
+============================
+Tests retry and rate-limit wiring of the shared session (no API calls).
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from utils.http_utils import JitterRetry, create_session
+
+
+class CountingLimiter:
+    """RateLimiter stand-in that only counts the slots taken."""
+
+    def __init__(self):
+        self.waits = 0
+
+    def wait(self):
+        self.waits += 1
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def test_retries_take_rate_limit_slots():
+    """Test every retry takes a limiter slot, across urllib3's per-attempt Retry copies."""
+    limiter = CountingLimiter()
+    retry = JitterRetry(total=5, backoff_factor=0, rate_limiter=limiter)
+
+    for _ in range(3):
+        retry = retry.increment(method="GET", url="/api")
+        retry.sleep()
+
+    assert limiter.waits == 3
+
+
+def test_session_shares_its_limiter_with_retries():
+    """Test create_session wires one limiter into both the session and its retries."""
+    session = create_session(max_requests_per_second=5)
+    assert session.get_adapter("https://").max_retries.rate_limiter is session.rate_limiter
+    assert create_session().get_adapter("https://").max_retries.rate_limiter is None
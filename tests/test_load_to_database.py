@@ -0,0 +1,121 @@
+"""
+Unit Tests for load_to_database.py
+==================================
+Tests the skip-if-unchanged load logic (fake connection, no database).
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from load import load_to_database
+from load.load_to_database import create_transactions_table, load_table_on_own_connection
+
+
+class FakeCursor:
+    """Cursor tracking only table comments (the loaded-file fingerprints) and which tables hold rows."""
+
+    def __init__(self, comments, filled):
+        self.comments = comments
+        self.filled = filled
+        self.result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        for table in re.findall(r"DROP TABLE IF EXISTS (raw\.\w+)", sql):
+            self.comments.pop(table, None)
+            self.filled.discard(table)
+        for table in re.findall(r"TRUNCATE TABLE (raw\.\w+)", sql):
+            self.filled.discard(table)
+        comment = re.search(r"COMMENT ON TABLE (raw\.\w+) IS", sql)
+        if comment:
+            self.comments[comment.group(1)] = params[0]
+        if "obj_description" in sql:
+            self.result = (self.comments.get(params[0]),)
+        exists = re.search(r"EXISTS \(SELECT 1 FROM (raw\.\w+)\)", sql)
+        if exists:
+            self.result = (exists.group(1) in self.filled,)
+
+    def fetchone(self):
+        return self.result
+
+
+class FakeConnection:
+    """Connection whose cursors share one database state across connections."""
+
+    def __init__(self, comments, filled):
+        self.comments = comments
+        self.filled = filled
+
+    def cursor(self):
+        return FakeCursor(self.comments, self.filled)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def make_fake_database(monkeypatch):
+    """Route load_to_database's connections to one shared fake database state."""
+    comments, filled = {}, set()
+    monkeypatch.setattr(load_to_database, "get_db_connection", lambda: FakeConnection(comments, filled))
+    return comments, filled
+
+
+def make_loader(filled, loads):
+    """Loader stand-in that records each load and marks the table as holding rows."""
+    def loader(conn, path, freeze=False, commit=True):
+        loads.append(path)
+        filled.add("raw.linea_transactions")
+        return 3
+    return loader
+
+
+def test_unchanged_transactions_file_is_skipped(tmp_path, monkeypatch):
+    """Test a second run with the same file skips the load (table not recreated)."""
+    comments, filled = make_fake_database(monkeypatch)
+    source = tmp_path / "transformed_transactions.parquet"
+    source.write_bytes(b"rows")
+    loads = []
+    loader = make_loader(filled, loads)
+
+    results = []
+    for _ in range(2):
+        create_transactions_table(FakeConnection(comments, filled))
+        results.append(load_table_on_own_connection("linea_transactions", loader, source, True))
+
+    assert results == [3, 0]
+    assert loads == [source]
+
+
+def test_emptied_table_is_reloaded_despite_fingerprint(tmp_path, monkeypatch):
+    """Test an UNLOGGED table emptied by a crash (comment kept) is reloaded."""
+    comments, filled = make_fake_database(monkeypatch)
+    source = tmp_path / "transformed_transactions.parquet"
+    source.write_bytes(b"rows")
+    loads = []
+    loader = make_loader(filled, loads)
+
+    load_table_on_own_connection("linea_transactions", loader, source, True)
+    filled.clear()  # crash recovery truncates UNLOGGED tables; the catalog comment survives
+
+    assert load_table_on_own_connection("linea_transactions", loader, source, True) == 3
+    assert loads == [source, source]
@@ -0,0 +1,125 @@
+"""
+Unit Tests for pg_copy.py
+=========================
+Tests the binary COPY encoder (no database connection).
+"""
+
+import sys
+import struct
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from utils.pg_copy import (
+    PG_COPY_HEADER,
+    PG_COPY_TRAILER,
+    NULL_FIELD,
+    copy_from_producer,
+    encode_numeric,
+    encode_column,
+    write_dataframe_to_pg_binary,
+    write_frames_to_pg_binary
+)
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def test_encode_numeric():
+    """Test base-10000 NUMERIC encoding."""
+    # 12345.678 -> digits [1, 2345, 6780], weight 1, dscale 3
+    assert encode_numeric(12345.678) == struct.pack(">hhHh3h", 3, 1, 0, 3, 1, 2345, 6780)
+    # 0.0001 -> single digit 1 at weight -1
+    assert encode_numeric(0.0001) == struct.pack(">hhHh1h", 1, -1, 0, 4, 1)
+    # negative values set the sign flag
+    assert encode_numeric(-1.5) == struct.pack(">hhHh2h", 2, 0, 0x4000, 1, 1, 5000)
+    # zero has no digits
+    assert encode_numeric(0) == struct.pack(">hhHh", 0, 0, 0, 0)
+
+
+def test_encode_column_numeric_matches_scalar_encoder():
+    """Test the bulk float path produces exactly encode_numeric's bytes."""
+    values = [12345.678, 0.0001, 1e-05, -1.5, 0.0, -0.0, 100.0, 1e16, 1.2345678901234568e+17, 5e-324, 0.1, 1.5]
+    fields = encode_column(pd.Series(values + [None]), "numeric")
+    for value, field in zip(values, fields):
+        payload = encode_numeric(value)
+        assert field == struct.pack(">i", len(payload)) + payload
+    assert fields[-1] == NULL_FIELD
+
+
+def test_encode_column_fixed_width():
+    """Test fixed-width columns get length prefixes and NULL markers."""
+    fields = encode_column(pd.Series([1, None, 3]), "int8")
+    assert fields[0] == struct.pack(">iq", 8, 1)
+    assert fields[1] == NULL_FIELD
+    assert fields[2] == struct.pack(">iq", 8, 3)
+
+
+def test_encode_column_rejects_out_of_range_integers():
+    """Test integers that do not fit the wire type raise instead of wrapping."""
+    assert encode_column(pd.Series([2**31 - 1, -2**31]), "int4")[0] == struct.pack(">ii", 4, 2**31 - 1)
+    for value in (2**31, -2**31 - 1):
+        with pytest.raises(ValueError, match="int4"):
+            encode_column(pd.Series([1, value], name="log_index"), "int4")
+
+
+def test_encode_column_timestamptz():
+    """Test timestamps are microseconds since 2000-01-01 UTC."""
+    fields = encode_column(pd.Series(["2000-01-01 00:00:01+00:00"]), "timestamptz")
+    assert fields[0] == struct.pack(">iq", 8, 1_000_000)
+
+
+def test_write_dataframe_to_pg_binary():
+    """Test full stream layout: header, rows, trailer."""
+    df = pd.DataFrame({"a": [7], "b": ["0xabc"]})
+    sink = BytesIO()
+
+    rows = write_dataframe_to_pg_binary(df, {"a": "int4", "b": "text"}, sink)
+
+    expected = (
+        PG_COPY_HEADER
+        + struct.pack(">h", 2)
+        + struct.pack(">ii", 4, 7)
+        + struct.pack(">i", 5) + b"0xabc"
+        + PG_COPY_TRAILER
+    )
+    assert rows == 1
+    assert sink.getvalue() == expected
+
+
+def test_write_frames_to_pg_binary_matches_single_frame():
+    """Test streaming frames produces one COPY stream identical to the whole frame."""
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", None, "z"]})
+    column_types = {"a": "int8", "b": "text"}
+    whole, streamed = BytesIO(), BytesIO()
+
+    write_dataframe_to_pg_binary(df, column_types, whole)
+    rows = write_frames_to_pg_binary(iter([df.iloc[:2], df.iloc[2:]]), column_types, streamed)
+
+    assert rows == 3
+    assert streamed.getvalue() == whole.getvalue()
+
+
+class FailingCopyCursor:
+    """Cursor whose COPY reads a little of the stream, then fails server-side."""
+
+    def copy_expert(self, sql, source, size=8192):
+        source.read(16)
+        raise RuntimeError("duplicate key value violates unique constraint")
+
+
+def test_copy_from_producer_surfaces_copy_error():
+    """Test a failed COPY raises the database error, not the producer's broken pipe."""
+    def produce(sink):
+        for _ in range(1024):  # far more than a pipe buffers
+            sink.write(b"x" * 65536)
+
+    with pytest.raises(RuntimeError, match="duplicate key"):
+        copy_from_producer(FailingCopyCursor(), "COPY t FROM STDIN", produce)
@@ -0,0 +1,34 @@
+"""
+Unit Tests for response_cache.py
+================================
+Tests the SQLite response cache (temporary file, no API calls).
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from utils.response_cache import ResponseCache
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def test_response_cache_roundtrip(tmp_path):
+    """Test bodies persist across cache instances and can be replaced."""
+    path = tmp_path / "cache" / "responses.sqlite"
+
+    cache = ResponseCache(path)
+    assert cache.get("txlist:0xabc:1:2:1") is None
+    cache.put("txlist:0xabc:1:2:1", b'{"status":"1","result":[]}')
+    cache.close()
+
+    cache = ResponseCache(path)
+    assert cache.get("txlist:0xabc:1:2:1") == b'{"status":"1","result":[]}'
+    cache.put("txlist:0xabc:1:2:1", b"{}")
+    assert cache.get("txlist:0xabc:1:2:1") == b"{}"
+    cache.close()
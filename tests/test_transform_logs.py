@@ -7,17 +7,22 @@ Tests pure transformation functions (no API calls, no file I/O).
 import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 # Add src to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / "src"))
 
 from transform.transform_logs import (
-    hex_to_int,
-    hex_to_address,
-    wei_to_eth,
-    decode_data,
-    parse_topics
+    _scalar_hex_to_int,
+    _scalar_hex_to_address,
+    _scalar_wei_to_eth,
+    _scalar_decode_data,
+    parse_topics,
+    parse_logs
 )
+import transform.transform_logs as transform_logs
 
 
 # =============================================================================
@@ -26,26 +31,27 @@ from transform.transform_logs import (
 
 def test_hex_to_int():
     """Test hex string to integer conversion."""
-    assert hex_to_int("0x1f4") == 500
-    assert hex_to_int("0x0") == 0
-    assert hex_to_int("0x") == 0
-    assert hex_to_int(None) == 0
+    assert _scalar_hex_to_int("0x1f4") == 500
+    assert _scalar_hex_to_int("0x0") == 0
+    assert _scalar_hex_to_int("0x") == 0
+    assert _scalar_hex_to_int(None) == 0
+    assert _scalar_hex_to_int(500) == 500  # already decoded (Parquet raw logs)
 
 
 def test_hex_to_address():
     """Test address extraction from padded hex."""
     # 32-byte padded hex (64 chars after 0x)
     padded = "0x000000000000000000000000d8da6bf26964af9d7eed9e03e53415d37aa96045"
-    assert hex_to_address(padded) == "0xd8da6bf26964af9d7eed9e03e53415d37aa96045"
-    assert hex_to_address(None) is None
+    assert _scalar_hex_to_address(padded) == "0xd8da6bf26964af9d7eed9e03e53415d37aa96045"
+    assert _scalar_hex_to_address(None) is None
 
 
 def test_wei_to_eth():
     """Test wei to ETH conversion."""
-    assert wei_to_eth(1_000_000_000_000_000_000) == 1.0  # 1 ETH
-    assert wei_to_eth(500_000_000_000_000_000) == 0.5    # 0.5 ETH
-    assert wei_to_eth(0) == 0.0
-    assert wei_to_eth(None) is None
+    assert _scalar_wei_to_eth(1_000_000_000_000_000_000) == 1.0  # 1 ETH
+    assert _scalar_wei_to_eth(500_000_000_000_000_000) == 0.5    # 0.5 ETH
+    assert _scalar_wei_to_eth(0) == 0.0
+    assert _scalar_wei_to_eth(None) is None
 
 
 def test_decode_data():
@@ -57,14 +63,14 @@ def test_decode_data():
     nonce_hex = format(42, '064x')
     data = "0x" + fee_hex + value_hex + nonce_hex + ("0" * 128)  # + padding
     
-    fee, value, nonce = decode_data(data)
+    fee, value, nonce = _scalar_decode_data(data)
     assert fee == 100
     assert value == 10**18
     assert nonce == 42
     
     # Edge case: short data
-    assert decode_data("0x") == (None, None, None)
-    assert decode_data(None) == (None, None, None)
+    assert _scalar_decode_data("0x") == (None, None, None)
+    assert _scalar_decode_data(None) == (None, None, None)
 
 
 def test_parse_topics():
@@ -73,6 +79,31 @@ def test_parse_topics():
     result = parse_topics(topics_str)
     assert result == ['0xabc', '0xdef', '0x123']
     assert parse_topics(None) == []
+    assert parse_topics(np.array(['0xabc', '0xdef'], dtype=object)) == ['0xabc', '0xdef']
+
+
+def test_parse_logs_parallel_matches_serial(monkeypatch):
+    """Test chunked parsing on a process pool gives the same frame as one pass."""
+    words = format(100, '064x') + format(10**18, '064x') + format(42, '064x')
+    raw = pd.DataFrame({
+        "topics": ["['0xsig', '0x%064x', '0x%064x', '0xhash%d']" % (i, i + 1, i) for i in range(10)],
+        "data": ["0x" + words] * 10,
+        "transactionHash": ["0xtx%d" % i for i in range(10)],
+        "blockHash": ["0xblock"] * 10,
+        "blockNumber": ["0x%x" % i for i in range(10)],
+        "timeStamp": ["0x65b4b000"] * 10,
+        "gasPrice": ["0x1"] * 10,
+        "gasUsed": ["0x2"] * 10,
+        "logIndex": ["0x0"] * 10,
+        "transactionIndex": ["0x3"] * 10,
+    })
+    
+    serial = parse_logs(raw.copy(), max_workers=1)
+    monkeypatch.setattr(transform_logs, "PARALLEL_CHUNK_ROWS", 4)
+    parallel = parse_logs(raw.copy(), max_workers=2)
+    
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert serial["value_eth"].eq(1.0).all()
 
 
 # =============================================================================
@@ -0,0 +1,220 @@
+"""
+Unit Tests for transform_transactions.py
+========================================
+Tests transformation functions (no API calls; file I/O only under tmp_path).
+"""
+
+import ast
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from transform.transform_transactions import (
+    _scalar_hex_to_int,
+    hex_series_to_int,
+    hex_series_to_float,
+    convert_unique,
+    first_occurrence_mask,
+    _scalar_wei_to_eth,
+    _scalar_wei_to_gwei,
+    _scalar_convert_timestamp,
+    transform_transactions,
+    transform_transactions_file
+)
+
+
+# Mixed inputs seen in txlist exports: decimal and hex text, padding, blanks
+MIXED_VALUES = [
+    "0x1f4", "0x", "", None, np.nan, " 42 ", "1e18", "3.7", "0X1F", "0xzz", "abc",
+    " +9007199254740993", "-12"
+]
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def test_hex_to_int():
+    """Test scalar hex/decimal string to integer conversion."""
+    assert _scalar_hex_to_int("0x1f4") == 500
+    assert _scalar_hex_to_int("500") == 500
+    assert _scalar_hex_to_int("0x") == 0
+    assert _scalar_hex_to_int(None) == 0
+    assert _scalar_hex_to_int("abc") == 0
+    assert _scalar_hex_to_int("9007199254740993") == 2**53 + 1  # no float rounding
+    assert _scalar_hex_to_int("2.9") == 2
+
+
+def test_hex_series_to_int_matches_scalar():
+    """Test the vectorized converter agrees with _scalar_hex_to_int row by row."""
+    result = hex_series_to_int(pd.Series(MIXED_VALUES, dtype=object))
+    assert result.tolist() == [_scalar_hex_to_int(v) for v in MIXED_VALUES]
+
+    # Typed (Parquet) columns pass through, NaN -> 0
+    assert hex_series_to_int(pd.Series([5, 7])).tolist() == [5, 7]
+    assert hex_series_to_int(pd.Series([1.9, np.nan])).tolist() == [1, 0]
+
+
+def test_hex_series_to_int_clean_columns():
+    """Test clean columns (single Arrow cast) still match the scalar helper."""
+    # Integers beyond 2**53 (wei-sized) stay exact, decimal or hex
+    values = ["12", "0x1f", "0X1F", "-5", None, "9007199254740993", "0x20000000000001"]
+    result = hex_series_to_int(pd.Series(values, dtype=object))
+    assert result.tolist() == [_scalar_hex_to_int(v) for v in values]
+    
+    amounts = ["1500000000000000000", "123456789012345678901234", None, "1e18", "2.9"]
+    result = hex_series_to_float(pd.Series(amounts, dtype=object))
+    assert result.tolist() == [float(_scalar_hex_to_int(v)) for v in amounts]
+
+
+def test_hex_series_to_int_rejects_values_beyond_int64():
+    """Test values above 2**63 - 1 raise instead of wrapping around."""
+    bounds = ["0x7fffffffffffffff", "9223372036854775807", "-9223372036854775808"]
+    assert hex_series_to_int(pd.Series(bounds)).tolist() == [_scalar_hex_to_int(v) for v in bounds]
+    
+    # Clean columns (one Arrow cast) and padded ones (general path) alike
+    for value in ["0x8000000000000000", "0xffffffffffffffff", "9223372036854775808", " 0x8000000000000000", " 1e19"]:
+        assert _scalar_hex_to_int(value) >= 2**63
+        with pytest.raises(ValueError):
+            hex_series_to_int(pd.Series(["12", value]))
+
+
+def test_hex_series_to_float_wide_values():
+    """Test wei amounts beyond int64 keep float(int) precision."""
+    values = ["123456789012345678901234", "0x" + "f" * 40, "0"]
+    result = hex_series_to_float(pd.Series(values))
+    assert result.tolist() == [float(_scalar_hex_to_int(v)) for v in values]
+
+
+def test_convert_unique_matches_direct():
+    """Test converting distinct values only gives the row-wise result."""
+    series = pd.Series(MIXED_VALUES * 3, dtype=object, index=range(5, 5 + 3 * len(MIXED_VALUES)))
+    result = convert_unique(series, hex_series_to_int)
+    pd.testing.assert_series_equal(result, hex_series_to_int(series))
+
+
+def test_wei_conversions():
+    """Test scalar Wei -> ETH/Gwei conversions."""
+    assert _scalar_wei_to_eth(1500000000000000000) == 1.5
+    assert _scalar_wei_to_gwei(2000000000) == 2.0
+    assert _scalar_wei_to_eth(None) == 0.0
+
+
+def make_raw_transactions():
+    """Small raw txlist frame: decimal and hex values, a duplicate hash, blanks."""
+    return pd.DataFrame({
+        "hash": ["0xa", "0xb", "0xa"],
+        "timeStamp": ["1700000000", "bad", "1700000000"],
+        "value": ["1500000000000000000", "0x0", "1500000000000000000"],
+        "gasPrice": ["2000000000", "0x3b9aca00", "2000000000"],
+        "blockNumber": ["100", "0x65", "100"],
+        "nonce": ["1", "2", "1"],
+        "gasUsed": ["21000", "50000", "21000"],
+        "isError": ["0", "1", "0"],
+        "txreceipt_status": ["1", "", "1"],
+        "from": ["0x1", "0x2", "0x1"],
+        "to": ["0x3", None, "0x3"],
+        "methodId": ["0x", "0xa9059cbb", "0x"],
+        "functionName": ["", "transfer(address,uint256)", ""],
+    })
+
+
+def test_transform_transactions():
+    """Test the full transform on a small raw txlist frame."""
+    raw = make_raw_transactions()
+
+    result = transform_transactions(raw)
+
+    assert result["hash"].tolist() == ["0xa", "0xb"]  # duplicate hash dropped
+    assert result["datetime"].iloc[0] == pd.Timestamp("2023-11-14 22:13:20")
+    assert result["datetime"].iloc[0] == _scalar_convert_timestamp("1700000000")
+    assert pd.isna(result["datetime"].iloc[1])
+    assert result["value_eth"].tolist() == [1.5, 0.0]
+    assert result["gas_price_gwei"].tolist() == [2.0, 1.0]
+    assert result["block_number"].tolist() == [100, 101]
+    assert result["is_error"].tolist() == [False, True]
+    assert result["tx_status"].tolist() == [True, False]
+
+
+def test_transform_transactions_file_matches_single_pass(tmp_path):
+    """Test the batched file transform dedups across batches like one pass."""
+    raw = make_raw_transactions()
+    raw["to"] = None  # all-null first batch must not pin a null column type
+    raw.loc[2, "to"] = "0x4"
+    raw = pd.concat([raw, raw.assign(hash=["0xc", "0xa", "0xd"])], ignore_index=True)
+    input_path = tmp_path / "raw.parquet"
+    raw.to_parquet(input_path, index=False)
+
+    rows, sample = transform_transactions_file(input_path, tmp_path / "out.parquet", batch_rows=2)
+
+    expected = transform_transactions(raw).reset_index(drop=True)
+    assert rows == len(expected) == 4
+    assert sample["hash"] == "0xa"
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "out.parquet"), expected)
+    
+    # Batches transformed on a process pool are written back in input order
+    rows, _ = transform_transactions_file(input_path, tmp_path / "pool.parquet", batch_rows=2, max_workers=2)
+    assert rows == 4
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "pool.parquet"), expected)
+
+
+def test_first_occurrence_mask_matches_duplicated():
+    """Test the Arrow first-occurrence mask equals ~duplicated(), across chunks and nulls."""
+    hashes = pd.Series(["0xa", None, "0xb", "0xa", None, "0xc", "0xb"])
+    chunked = pa.chunked_array([pa.array(hashes[:3]), pa.array(hashes[3:])])
+    
+    assert first_occurrence_mask(chunked).tolist() == (~hashes.duplicated()).tolist()
+    assert first_occurrence_mask(pa.chunked_array([], pa.string())).tolist() == []
+
+
+def test_transforms_have_no_row_wise_apply():
+    """Test the transform modules never call .apply (row-by-row Python)."""
+    for path in (PROJECT_ROOT / "src" / "transform").glob("transform_*.py"):
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        calls = [
+            node.lineno for node in ast.walk(tree)
+            if isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "apply"
+        ]
+        assert not calls, f"{path.name}: .apply() on line(s) {calls}"
+
+
+# =============================================================================
+# RUN
+# =============================================================================
+
+if __name__ == "__main__":
+    # Simple test runner
+    tests = [
+        test_hex_to_int,
+        test_hex_series_to_int_matches_scalar,
+        test_hex_series_to_int_clean_columns,
+        test_hex_series_to_int_rejects_values_beyond_int64,
+        test_hex_series_to_float_wide_values,
+        test_convert_unique_matches_direct,
+        test_wei_conversions,
+        test_transform_transactions,
+        test_first_occurrence_mask_matches_duplicated,
+        test_transforms_have_no_row_wise_apply
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{'='*40}")
+    print(f"Passed: {passed}/{len(tests)}")